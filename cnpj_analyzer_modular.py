@@ -10,39 +10,57 @@ import os
 import sys
 import re
 import json
-import yaml
 import logging
+import logging.handlers
+import atexit
+import functools
+import contextlib
+import multiprocessing
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from enum import Enum
-import concurrent.futures
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 
 import typer
 from rich.console import Console
 from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.text import Text
-from jinja2 import Template
 
-# Adicionar src ao path para imports
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-from analyzer_factory import AnalyzerFactory
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
+# Configuração de logging (apenas se ainda não houver handlers configurados).
+# Só no processo principal: os workers do analyze_all enviam seus registros a
+# ele por uma fila (ver _init_worker), então apenas um processo escreve no
+# console e no arquivo de log.
+if not logging.getLogger().handlers and multiprocessing.parent_process() is None:
+    # A escrita em disco fica com a thread do QueueListener
+    _log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue,
         logging.FileHandler('logs/cnpj_analyzer.log'),
         logging.StreamHandler()
-    ]
-)
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.handlers.QueueHandler(_log_queue)]
+    )
 
 console = Console()
 app = typer.Typer()
@@ -61,7 +79,134 @@ class Status(Enum):
     INCOMPATIBLE = "incompativel"
     NEEDS_ANALYSIS = "precisa_analise"
 
-@dataclass
+# Mapeamento de palavras-chave (minúsculas) para nível de impacto
+_IMPACT_KEYWORDS = {
+    'critical': ImpactLevel.CRITICAL,
+    'critico': ImpactLevel.CRITICAL,
+    'high': ImpactLevel.HIGH,
+    'alto': ImpactLevel.HIGH,
+    'medium': ImpactLevel.MEDIUM,
+    'medio': ImpactLevel.MEDIUM,
+    'low': ImpactLevel.LOW,
+    'baixo': ImpactLevel.LOW
+}
+
+# Palavras-chave de impacto em representações textuais de campos
+_IMPACT_RE = re.compile(r'critical|critico|high|alto|medium|medio', re.IGNORECASE)
+_impact_search = _IMPACT_RE.search
+
+# Valores de impacto que colocam um campo na seção de campos críticos
+_CRITICAL_TAGS = frozenset({'critico', 'critical'})
+
+# Ordem dos níveis de impacto, para comparação barata
+_IMPACT_RANK = {
+    ImpactLevel.LOW: 0,
+    ImpactLevel.MEDIUM: 1,
+    ImpactLevel.HIGH: 2,
+    ImpactLevel.CRITICAL: 3
+}
+
+# Filtros das opções --skip-tests e --focus-migrations
+_SKIP_TEST_PATTERNS = ('tests', 'Tests', 'test', 'Test')
+_MIGRATION_PATTERNS = ('migration', 'Migration', 'migrations', 'Migrations')
+
+# Quantidade mínima de projetos para exibir a barra de progresso
+_PROGRESS_MIN_PROJECTS = 8
+
+# Padrões de caminho usados na categorização dos campos
+_TEST_RE = re.compile(r'test|spec|phpunit|jest|junit')
+_MIGRATION_RE = re.compile(r'migration')
+_ETL_RE = re.compile(r'\.ktr|\.kjb|\.xml|pentaho|etl')
+_CODE_RE = re.compile(r'\.(?:php|js|ts|vue|py|java)')
+_test_search = _TEST_RE.search
+_migration_search = _MIGRATION_RE.search
+_etl_search = _ETL_RE.search
+_code_search = _CODE_RE.search
+
+# Palavras-chave de caminho por subcategoria de código, em ordem de prioridade
+_CODE_SUBCATEGORY_PATTERNS = {
+    'repositories': ['repository', 'repo', 'dao', 'dataaccess'],
+    'interfaces': ['interface', 'contract', 'abstract'],
+    'services': ['service', 'business', 'facade'],
+    'controllers': ['controller', 'handler', 'action'],
+    'models': ['model', 'entity', 'dto', 'vo'],
+    'components': ['component', 'molecule', 'atom', 'organism'],
+    'utils': ['util', 'helper', 'mixin', 'utility']
+}
+
+# Cada alternativa é um lookahead ancorado no início do caminho: as
+# subcategorias são testadas na ordem acima (e não pela posição no caminho),
+# e o nome do grupo vazio que casou identifica a subcategoria (lastgroup)
+_CODE_SUBCATEGORY_RE = re.compile('|'.join(
+    f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))(?P<{subcategory}>)"
+    for subcategory, keywords in _CODE_SUBCATEGORY_PATTERNS.items()
+))
+_subcategory_match = _CODE_SUBCATEGORY_RE.match
+
+if AHOCORASICK_AVAILABLE:
+    # Autômato com todas as palavras-chave: uma única passada pelo caminho
+    # retorna todas as ocorrências, e vence a subcategoria de maior prioridade
+    _CODE_SUBCATEGORY_AC = ahocorasick.Automaton()
+    for _priority, (_subcategory, _keywords) in enumerate(_CODE_SUBCATEGORY_PATTERNS.items()):
+        for _keyword in _keywords:
+            _CODE_SUBCATEGORY_AC.add_word(_keyword, (_priority, _subcategory))
+    _CODE_SUBCATEGORY_AC.make_automaton()
+
+
+def _match_code_subcategory(file_path_lower: str) -> str:
+    """Retorna a subcategoria de código do caminho (ou 'other_code')"""
+    if AHOCORASICK_AVAILABLE:
+        best = None
+        for _, (priority, subcategory) in _CODE_SUBCATEGORY_AC.iter(file_path_lower):
+            if best is None or priority < best[0]:
+                best = (priority, subcategory)
+                if priority == 0:
+                    break
+        return best[1] if best else 'other_code'
+    
+    match = _subcategory_match(file_path_lower)
+    return match.lastgroup if match else 'other_code'
+
+# Títulos das seções do relatório Markdown
+_CATEGORY_NAMES = {
+    'migrations': '📁 MIGRAÇÕES',
+    'tests': '🧪 TESTES',
+    'etl': '🗄️ ETL',
+    'others': '📄 OUTROS'
+}
+
+_SUBCATEGORY_TITLES = {
+    'validations': '🔍 VALIDAÇÕES',
+    'frontend_masks': '🎭 MÁSCARAS FRONTEND',
+    'repositories': '🗄️ REPOSITORIES',
+    'interfaces': '📋 INTERFACES',
+    'services': '⚙️ SERVICES',
+    'controllers': '🎮 CONTROLLERS',
+    'models': '📊 MODELS',
+    'components': '🧩 COMPONENTS',
+    'utils': '🔧 UTILS/HELPERS',
+    'other_code': '💻 OUTROS CÓDIGOS'
+}
+
+# Nomes das subcategorias no resumo de campos de código
+_SUBCATEGORY_NAMES = {
+    'validations': '🔍 Validações',
+    'frontend_masks': '🎭 Máscaras Frontend',
+    'repositories': '🗄️ Repositories',
+    'interfaces': '📋 Interfaces',
+    'services': '⚙️ Services',
+    'controllers': '🎮 Controllers',
+    'models': '📊 Models',
+    'components': '🧩 Components',
+    'utils': '🔧 Utils/Helpers',
+    'other_code': '💻 Outros Códigos'
+}
+
+# Linhas das tabelas do relatório Markdown
+_CRITICAL_ROW = "| %s | %s | %s | %s | %s | %s | %s |\n"
+_FIELD_ROW = "| %s | %s | %s | %s | %s | %s | %s | %s | %s |\n"
+
+@dataclass(slots=True)
 class CNPJField:
     """Representa um campo CNPJ encontrado"""
     file_path: str
@@ -90,13 +235,117 @@ class ProjectAnalysis:
     recommendations: List[str]
     analysis_date: datetime
 
+@dataclass
+class FieldScan:
+    """Resumo dos campos de um relatório, calculado em uma única passada"""
+    impact_counts: Dict[str, int]
+    categorized: Dict[str, Any]
+    critical_fields: List[Dict[str, Any]]
+    overall_impact: ImpactLevel
+
+def _serialize_str_field(field: str) -> Dict[str, Any]:
+    """Representação textual: não há dados estruturados do campo"""
+    return {
+        'file_path': 'Campo CNPJ',
+        'line_number': '-',
+        'field_name': 'CNPJ',
+        'field_type': 'UNKNOWN',
+        'field_size': None,
+        'impact_level': 'MEDIUM',
+        'status': 'NEEDS_ANALYSIS',
+        'action_needed': 'Análise manual necessária',
+        'estimated_effort': '4-8 horas'
+    }
+
+def _serialize_dataclass_field(field: CNPJField) -> Dict[str, Any]:
+    """Dataclass local: todos os atributos estão presentes"""
+    field_dict = asdict(field)
+    field_dict['impact_level'] = field.impact_level.value
+    field_dict['status'] = field.status.value
+    return field_dict
+
+def _serialize_legacy_field(field: Any) -> Dict[str, Any]:
+    """Fallback para objetos antigos sem to_dict"""
+    return {
+        'file_path': getattr(field, 'file_path', 'Unknown'),
+        'line_number': getattr(field, 'line_number', 0),
+        'field_name': getattr(field, 'field_name', 'Unknown'),
+        'field_type': getattr(field, 'field_type', 'Unknown'),
+        'field_size': getattr(field, 'field_size', None),
+        'context': getattr(field, 'context', ''),
+        'project_type': getattr(field, 'project_type', 'unknown'),
+        'impact_level': getattr(getattr(field, 'impact_level', None), 'value', 'MEDIUM'),
+        'status': getattr(getattr(field, 'status', None), 'value', 'NEEDS_ANALYSIS'),
+        'action_needed': getattr(field, 'action_needed', 'Análise manual necessária'),
+        'estimated_effort': getattr(field, 'estimated_effort', '4-8 horas')
+    }
+
+def _identity(value: Any) -> Any:
+    """Campo já serializado (dicionário): usado como está, sem cópia"""
+    return value
+
+# Serializador escolhido uma única vez por classe de campo
+_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+def _get_serializer(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """Retorna (e memoriza) a função de serialização para uma classe de campo"""
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is None:
+        if issubclass(cls, dict):
+            serializer = _identity
+        elif issubclass(cls, str):
+            serializer = _serialize_str_field
+        elif callable(getattr(cls, 'to_dict', None)):
+            # Interface CNPJFieldInterface
+            serializer = cls.to_dict
+        elif issubclass(cls, CNPJField):
+            serializer = _serialize_dataclass_field
+        else:
+            serializer = _serialize_legacy_field
+        _SERIALIZERS[cls] = serializer
+    return serializer
+
+@functools.cache
+def _factory():
+    """Carrega a AnalyzerFactory sob demanda (uma vez por processo)
+    
+    Evita importar todos os analisadores em comandos que não os usam e na
+    inicialização dos processos worker antes do primeiro projeto.
+    """
+    # Adicionar src ao path para imports
+    sys.path.insert(0, str(Path(__file__).parent / 'src'))
+    
+    from analyzer_factory import AnalyzerFactory
+    return AnalyzerFactory()
+
+@functools.cache
+def _exporter(reports_dir: str):
+    """Retorna o PresentationExporter de um diretório de relatórios
+    
+    O módulo (e o python-pptx/weasyprint que ele importa) é carregado apenas
+    na primeira exportação; o exportador não guarda estado entre chamadas.
+    """
+    from src.exporters.presentation_exporter import PresentationExporter
+    return PresentationExporter(reports_dir)
+
+@functools.cache
+def _general_analyzer_class():
+    """Importa o GeneralAnalyzer sob demanda (uma vez por processo)"""
+    from src.application.general_analyzer import GeneralAnalyzer
+    return GeneralAnalyzer
+
 class CNPJAnalyzerModular:
     """Analisador principal modular para identificar impactos do CNPJ alfanumérico"""
     
     def __init__(self):
-        self.factory = AnalyzerFactory()
-        self.console = Console()
+        self.console = console
         self.logger = logging.getLogger(__name__)
+        # Escrita dos relatórios JSON e Markdown em paralelo (I/O); criado no
+        # primeiro uso, já que os workers do analyze_all não gravam relatórios
+        self._report_pool = None
+        # Fila de relatórios gravados em segundo plano durante o analyze_all
+        self._write_queue = queue.Queue()
+        self._writer_thread = None
 
     def analyze_project(self, project_path: Path, project_type: Optional[str] = None, filters: Optional[Dict] = None) -> Dict[str, Any]:
         """Analisa um projeto usando o analisador apropriado"""
@@ -108,7 +357,7 @@ class CNPJAnalyzerModular:
             self.console.print(f"[blue]Tipo detectado: {project_type}[/blue]")
             
             # Usar factory para criar analisador apropriado
-            result = self.factory.analyze_project(project_path, filters)
+            result = self.factory.analyze_project(project_path, filters, project_type=project_type)
             
             return result
             
@@ -121,6 +370,54 @@ class CNPJAnalyzerModular:
                 'project_type': project_type or 'unknown'
             }
 
+    @property
+    def _io_pool(self) -> ThreadPoolExecutor:
+        """Pool de threads da escrita de relatórios, criado sob demanda"""
+        if self._report_pool is None:
+            self._report_pool = ThreadPoolExecutor(max_workers=2)
+        return self._report_pool
+
+    @property
+    def factory(self):
+        """AnalyzerFactory compartilhada, carregada no primeiro uso"""
+        return _factory()
+
+    def _detect_entry_type(self, entry: os.DirEntry) -> str:
+        """Detecta o tipo de um projeto descoberto
+        
+        Lista o primeiro nível da pasta uma única vez e repassa os nomes à
+        factory, que decide por eles (composer.json, package.json, arquivos
+        ETL) sem listar a pasta de novo.
+        """
+        try:
+            with os.scandir(entry.path) as children:
+                names = {child.name for child in children}
+        except OSError:
+            names = None
+        
+        return self.factory.detect_project_type(Path(entry.path), names)
+
+    def _iter_projects(self, projects_folder: Path):
+        """Gera os projetos de uma pasta conforme são encontrados"""
+        # os.scandir reaproveita o tipo da entrada retornado pelo readdir,
+        # evitando um stat() extra por item
+        with os.scandir(projects_folder) as entries:
+            for entry in entries:
+                # Ignorar diretórios ocultos (.git, .idea, ...)
+                if entry.name.startswith('.') or not entry.is_dir(follow_symlinks=False):
+                    continue
+
+                project_type = self._detect_entry_type(entry)
+
+                status_icon = "✓" if project_type != 'unknown' else "⚠"
+                self.console.print(f"  {status_icon} {entry.name} ({project_type})")
+
+                yield {
+                    'name': entry.name,
+                    'path': entry.path,
+                    'type': project_type
+                }
+
     def discover_projects(self, projects_folder: Path) -> List[Dict[str, Any]]:
         """Descobre projetos em uma pasta"""
         projects = []
@@ -131,103 +428,128 @@ class CNPJAnalyzerModular:
         
         self.console.print(f"[blue]Descobrindo projetos em: {projects_folder}[/blue]")
         
-        for item in projects_folder.iterdir():
-            if item.is_dir():
-                project_type = self.factory.detect_project_type(item)
-                
-                projects.append({
-                    'name': item.name,
-                    'path': str(item),
-                    'type': project_type
-                })
-                
-                status_icon = "✓" if project_type != 'unknown' else "⚠"
-                self.console.print(f"  {status_icon} {item.name} ({project_type})")
+        projects = list(self._iter_projects(projects_folder))
         
         self.console.print(f"✓ Encontrados {len(projects)} projetos")
         return projects
 
     def analyze_all_projects(self, projects_folder: Path, output_dir: Path, max_workers: int = 4, filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
-        """Analisa todos os projetos em uma pasta usando multithreading"""
-        projects = self.discover_projects(projects_folder)
+        """Analisa todos os projetos em uma pasta usando múltiplos processos"""
         results = []
         
-        if not projects:
-            self.console.print("[red]Nenhum projeto encontrado[/red]")
+        if not projects_folder.exists():
+            self.console.print(f"[red]Pasta não encontrada: {projects_folder}[/red]")
             return results
         
-        self.console.print(f"[blue]Iniciando análise paralela de {len(projects)} projetos com {max_workers} workers...[/blue]")
+        self.console.print(f"[blue]Iniciando análise paralela de {projects_folder} com {max_workers} workers...[/blue]")
         if filters:
             self.console.print(f"[yellow]Filtros aplicados: {filters}[/yellow]")
         
-        # Lock para thread-safe logging
-        lock = threading.Lock()
+        # Executar análise em paralelo (processos, já que a análise é CPU-bound).
+        # "spawn" evita herdar via fork o estado de threads do processo principal.
+        # O logging dos workers chega por log_queue e é repassado ao do
+        # processo principal pela thread do QueueListener
+        mp_context = multiprocessing.get_context("spawn")
+        log_queue = mp_context.Queue()
+        log_listener = logging.handlers.QueueListener(log_queue, _LogRelayHandler())
+        log_listener.start()
+        try:
+            results = self._run_project_pool(projects_folder, output_dir, max_workers, filters,
+                                             mp_context, log_queue)
+        finally:
+            log_listener.stop()
+        
+        # Aguardar a gravação dos relatórios pendentes
+        self._write_queue.join()
+        
+        self.console.print(f"✓ Análise paralela concluída para {len(results)} projetos")
+        return results
+
+    def _run_project_pool(self, projects_folder: Path, output_dir: Path, max_workers: int,
+                          filters: Optional[Dict], mp_context, log_queue) -> List[Dict[str, Any]]:
+        """Analisa os projetos da pasta no pool de processos e agenda seus relatórios"""
+        results = []
+        
+        # Importado aqui: só este comando exibe barra de progresso
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         
-        def analyze_single_project(project):
-            """Função para analisar um projeto individual"""
-            project_path = Path(project['path'])
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                 initializer=_init_worker, initargs=(log_queue,)) as executor:
+            # Submeter cada projeto assim que é descoberto, sem esperar a
+            # varredura completa da pasta
+            future_to_project = {}
+            for project in self._iter_projects(projects_folder):
+                future = executor.submit(_analyze_single_project, project, filters)
+                future_to_project[future] = project
             
-            try:
-                result = self.analyze_project(project_path, filters)
-                result['project_name'] = project['name']
-                result['project_path'] = project['path']
-                
-                # Verificar se houve erro na análise
-                if 'error' in result and result['error']:
-                    with lock:
-                        self.logger.error(f"Erro ao analisar {project['name']}: {result['error']}")
-                        self.console.print(f"✗ {project['name']} - Erro: {result['error']}")
-                else:
-                    # Determinar impacto geral
-                    try:
-                        impact = self._determine_overall_impact(result)
-                        impact_str = impact.value if hasattr(impact, 'value') else str(impact)
-                        with lock:
-                            self.console.print(f"✓ {project['name']} - Impacto: {impact_str}")
-                    except Exception as e:
-                        with lock:
-                            self.logger.error(f"Erro ao determinar impacto para {project['name']}: {e}")
-                            self.console.print(f"✓ {project['name']} - Impacto: MEDIUM (erro na determinação)")
-                    
-                    # Salvar relatório individual
-                    self._save_individual_report(result, output_dir)
-                
-                return result
-                
-            except Exception as e:
-                with lock:
-                    self.logger.error(f"Erro ao analisar {project['name']}: {e}")
-                    self.console.print(f"✗ {project['name']} - Erro: {e}")
-                return None
-        
-        # Executar análise em paralelo
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submeter todas as tarefas
-            future_to_project = {executor.submit(analyze_single_project, project): project for project in projects}
+            if not future_to_project:
+                self.console.print("[red]Nenhum projeto encontrado[/red]")
+                return results
+            
+            self.console.print(f"✓ Encontrados {len(future_to_project)} projetos")
             
-            # Processar resultados conforme completam
-            with Progress(
+            # Poucos projetos: as linhas de status já indicam o andamento e a
+            # barra de progresso só acrescentaria custo de renderização
+            use_progress = len(future_to_project) >= _PROGRESS_MIN_PROJECTS
+            progress_context = Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
-                console=self.console
-            ) as progress:
-                task = progress.add_task("Analisando projetos...", total=len(projects))
+                console=self.console,
+                refresh_per_second=4,
+                transient=True
+            ) if use_progress else contextlib.nullcontext()
+            
+            with progress_context as progress:
+                if use_progress:
+                    task = progress.add_task("Analisando projetos...", total=len(future_to_project))
                 
+                # Processar resultados conforme completam
                 for future in as_completed(future_to_project):
                     project = future_to_project[future]
                     try:
-                        result = future.result()
-                        if result:
-                            results.append(result)
+                        status = future.result()
+                        self._report_project_status(status)
+                        if status['result'] is not None:
+                            results.append(status['result'])
+                            if not status['error']:
+                                # Gravação em segundo plano: libera o laço para o próximo resultado
+                                self._enqueue_report(status['result'], output_dir)
                     except Exception as e:
-                        with lock:
-                            self.logger.error(f"Erro inesperado ao analisar {project['name']}: {e}")
+                        self.logger.error(f"Erro inesperado ao analisar {project['name']}: {e}")
                     
-                    progress.advance(task)
+                    if use_progress:
+                        progress.advance(task)
         
-        self.console.print(f"✓ Análise paralela concluída para {len(results)} projetos")
         return results
 
+    def _enqueue_report(self, result: Dict[str, Any], output_dir: Path):
+        """Agenda a gravação do relatório de um projeto na thread de escrita"""
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
+        self._write_queue.put((result, output_dir))
+
+    def _writer_loop(self):
+        """Grava, em ordem de chegada, os relatórios colocados na fila"""
+        while True:
+            result, output_dir = self._write_queue.get()
+            try:
+                self._save_individual_report(result, output_dir)
+            finally:
+                self._write_queue.task_done()
+
+    def _report_project_status(self, status: Dict[str, Any]):
+        """Exibe no processo principal o status retornado por um worker"""
+        name = status['name']
+        if status['error']:
+            self.logger.error(f"Erro ao analisar {name}: {status['error']}")
+            self.console.print(f"✗ {name} - Erro: {status['error']}")
+        elif status['impact_error']:
+            self.logger.error(f"Erro ao determinar impacto para {name}: {status['impact_error']}")
+            self.console.print(f"✓ {name} - Impacto: MEDIUM (erro na determinação)")
+        else:
+            self.console.print(f"✓ {name} - Impacto: {status['impact']}")
+
     def _determine_overall_impact(self, result: Dict[str, Any]) -> ImpactLevel:
         """Determina o impacto geral baseado nos campos encontrados"""
         if 'cnpj_fields_found' not in result:
@@ -237,55 +559,93 @@ class CNPJAnalyzerModular:
         if not cnpj_fields:
             return ImpactLevel.LOW
         
-        # Contar campos por nível de impacto
-        impact_counts = {
-            ImpactLevel.LOW: 0,
-            ImpactLevel.MEDIUM: 0,
-            ImpactLevel.HIGH: 0,
-            ImpactLevel.CRITICAL: 0
-        }
+        # Normalização preguiçosa para preservar o retorno antecipado em CRITICAL
+        return self._highest_impact(map(self._normalize_field, cnpj_fields))
+
+    def _highest_impact(self, fields) -> ImpactLevel:
+        """Retorna o maior nível de impacto entre campos normalizados"""
+        # Maior nível encontrado; CRITICAL encerra a busca imediatamente
+        best = ImpactLevel.LOW
+        best_rank = 0
+        impact_from_keyword = self._impact_from_keyword
         
-        for field in cnpj_fields:
-            # Verificar se é string (representação) ou objeto
-            if isinstance(field, str):
-                # Se for string, procurar por padrões de impacto
-                if 'CRITICAL' in field or 'critico' in field:
-                    impact_counts[ImpactLevel.CRITICAL] += 1
-                elif 'HIGH' in field or 'alto' in field:
-                    impact_counts[ImpactLevel.HIGH] += 1
-                elif 'MEDIUM' in field or 'medio' in field:
-                    impact_counts[ImpactLevel.MEDIUM] += 1
-                else:
-                    impact_counts[ImpactLevel.LOW] += 1
-            elif isinstance(field, dict):
-                # Se for dicionário (dados serializados)
-                impact_level_str = field.get('impact_level', 'MEDIUM').lower()
-                if 'critical' in impact_level_str or 'critico' in impact_level_str:
-                    impact_counts[ImpactLevel.CRITICAL] += 1
-                elif 'high' in impact_level_str or 'alto' in impact_level_str:
-                    impact_counts[ImpactLevel.HIGH] += 1
-                elif 'medium' in impact_level_str or 'medio' in impact_level_str:
-                    impact_counts[ImpactLevel.MEDIUM] += 1
-                else:
-                    impact_counts[ImpactLevel.LOW] += 1
-            elif hasattr(field, 'impact_level'):
-                impact_counts[field.impact_level] += 1
+        for field in fields:
+            level = impact_from_keyword(field['impact_level'])
+            rank = _IMPACT_RANK[level]
+            if rank > best_rank:
+                best, best_rank = level, rank
+                if best is ImpactLevel.CRITICAL:
+                    return best
         
-        # Determinar impacto geral
-        if impact_counts[ImpactLevel.CRITICAL] > 0:
-            return ImpactLevel.CRITICAL
-        elif impact_counts[ImpactLevel.HIGH] > 0:
-            return ImpactLevel.HIGH
-        elif impact_counts[ImpactLevel.MEDIUM] > 0:
-            return ImpactLevel.MEDIUM
+        return best
+
+    def _normalize_field(self, field: Any) -> Dict[str, Any]:
+        """Converte um campo (DTO, dicionário ou string) para um dicionário uniforme"""
+        if isinstance(field, dict):
+            normalized = {
+                'file_path': field.get('file_path', 'Unknown'),
+                'line_number': field.get('line_number', '?'),
+                'field_name': field.get('field_name', 'Unknown'),
+                'field_type': field.get('field_type', 'Unknown'),
+                'field_size': field.get('field_size'),
+                'impact_level': str(field.get('impact_level', 'medio')),
+                'status': field.get('status', 'precisa_analise'),
+                'action_needed': field.get('action_needed', 'Análise manual necessária'),
+                'estimated_effort': field.get('estimated_effort', 'A definir')
+            }
+        elif isinstance(field, str):
+            # Representação textual: apenas o nível de impacto pode ser inferido
+            match = _impact_search(field)
+            impact_level = _IMPACT_KEYWORDS[match.group(0).lower()] if match else ImpactLevel.LOW
+            normalized = {
+                'file_path': 'Campo CNPJ',
+                'line_number': '-',
+                'field_name': 'CNPJ',
+                'field_type': 'UNKNOWN',
+                'field_size': None,
+                'impact_level': impact_level.value,
+                'status': 'precisa_analise',
+                'action_needed': 'Análise manual necessária',
+                'estimated_effort': 'A definir'
+            }
         else:
-            return ImpactLevel.LOW
+            # Objetos (CNPJFieldInterface ou dataclasses antigas); os DTOs usam um Enum próprio
+            impact_level = getattr(field, 'impact_level', 'medio')
+            status = getattr(field, 'status', 'precisa_analise')
+            normalized = {
+                'file_path': getattr(field, 'file_path', 'Unknown'),
+                'line_number': getattr(field, 'line_number', '?'),
+                'field_name': getattr(field, 'field_name', 'Unknown'),
+                'field_type': getattr(field, 'field_type', 'Unknown'),
+                'field_size': getattr(field, 'field_size', None),
+                'impact_level': str(getattr(impact_level, 'value', impact_level)),
+                'status': getattr(status, 'value', status),
+                'action_needed': getattr(field, 'action_needed', 'Análise manual necessária'),
+                'estimated_effort': getattr(field, 'estimated_effort', 'A definir')
+            }
+        
+        # Caminho em minúsculas calculado uma única vez para a categorização
+        normalized['_file_path_lower'] = str(normalized['file_path']).lower()
+        return normalized
+
+    def _normalize_fields(self, cnpj_fields: List) -> List[Dict[str, Any]]:
+        """Normaliza todos os campos uma única vez para os relatórios"""
+        return [self._normalize_field(field) for field in cnpj_fields]
+
+    def _impact_from_keyword(self, impact_level: str) -> ImpactLevel:
+        """Converte o texto de um nível de impacto para ImpactLevel"""
+        level = _IMPACT_KEYWORDS.get(impact_level.lower())
+        if level is None:
+            match = _impact_search(impact_level)
+            level = _IMPACT_KEYWORDS[match.group(0).lower()] if match else ImpactLevel.LOW
+        return level
 
     def _save_individual_report(self, result: Dict[str, Any], output_dir: Path):
         """Salva relatório individual para um projeto"""
         try:
             project_name = result.get('project_name', 'unknown')
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Data da análise lida uma única vez para todo o relatório
+            now = datetime.now()
             
             # Salvar JSON
             json_file = output_dir / f"{project_name}_analysis.json"
@@ -297,72 +657,48 @@ class CNPJAnalyzerModular:
                     # Converter campos CNPJ para formato serializável
                     serializable_fields = []
                     for field in value:
-                        if isinstance(field, str):
-                            # Extrair informações da string
-                            serializable_fields.append({
-                                'file_path': 'Campo CNPJ',
-                                'line_number': '-',
-                                'field_name': 'CNPJ',
-                                'field_type': 'UNKNOWN',
-                                'field_size': None,
-                                'impact_level': 'MEDIUM',
-                                'status': 'NEEDS_ANALYSIS',
-                                'action_needed': 'Análise manual necessária',
-                                'estimated_effort': '4-8 horas'
-                            })
-                        else:
-                            # Usar a interface CNPJFieldInterface para serialização
-                            if hasattr(field, 'to_dict'):
-                                serializable_fields.append(field.to_dict())
-                            else:
-                                # Fallback para objetos antigos
-                                impact_level = getattr(field, 'impact_level', None)
-                                if hasattr(impact_level, 'value'):
-                                    impact_level = impact_level.value
-                                else:
-                                    impact_level = 'MEDIUM'
-                                
-                                status = getattr(field, 'status', None)
-                                if hasattr(status, 'value'):
-                                    status = status.value
-                                else:
-                                    status = 'NEEDS_ANALYSIS'
-                                
-                                serializable_fields.append({
-                                    'file_path': getattr(field, 'file_path', 'Unknown'),
-                                    'line_number': getattr(field, 'line_number', 0),
-                                    'field_name': getattr(field, 'field_name', 'Unknown'),
-                                    'field_type': getattr(field, 'field_type', 'Unknown'),
-                                    'field_size': getattr(field, 'field_size', None),
-                                    'context': getattr(field, 'context', ''),
-                                    'project_type': getattr(field, 'project_type', 'unknown'),
-                                    'impact_level': impact_level,
-                                    'status': status,
-                                    'action_needed': getattr(field, 'action_needed', 'Análise manual necessária'),
-                                    'estimated_effort': getattr(field, 'estimated_effort', '4-8 horas')
-                                })
+                        serializable_fields.append(_get_serializer(type(field))(field))
                     serializable_result[key] = serializable_fields
                 else:
                     serializable_result[key] = value
             
-
+            # Gravar JSON e Markdown ao mesmo tempo
+            md_file = output_dir / f"{project_name}_analysis.md"
+            wait([
+                self._io_pool.submit(self._write_json_report, json_file, serializable_result),
+                self._io_pool.submit(self._write_markdown_report, result, md_file, now)
+            ])
             
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(serializable_result, f, indent=2, ensure_ascii=False)
+            self.console.print(f"Relatório salvo em: {output_dir}")
             
-            # Salvar Markdown
-            md_file = output_dir / f"{project_name}_analysis.md"
-            try:
-                self._generate_markdown_report(result, md_file)
-            except Exception as e:
-                self.logger.error(f"Erro ao gerar Markdown para {project_name}: {e}")
-                # Criar um Markdown básico em caso de erro
-                basic_content = f"""# Relatório de Análise CNPJ Alfanumérico
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar relatório: {e}")
+
+    def _write_json_report(self, json_file: Path, serializable_result: Dict[str, Any]):
+        """Grava o relatório JSON de um projeto"""
+        try:
+            if ORJSON_AVAILABLE:
+                # orjson serializa em C e já produz UTF-8
+                json_file.write_bytes(orjson.dumps(serializable_result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                json_file.write_text(json.dumps(serializable_result, indent=2, ensure_ascii=False), encoding='utf-8')
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar relatório JSON {json_file}: {e}")
+
+    def _write_markdown_report(self, result: Dict[str, Any], md_file: Path, now: datetime):
+        """Grava o relatório Markdown de um projeto, com versão básica em caso de erro"""
+        project_name = result.get('project_name', 'unknown')
+        try:
+            self._generate_markdown_report(result, md_file, now=now)
+        except Exception as e:
+            self.logger.error(f"Erro ao gerar Markdown para {project_name}: {e}")
+            # Criar um Markdown básico em caso de erro
+            basic_content = f"""# Relatório de Análise CNPJ Alfanumérico
 
 ## Informações do Projeto
 - **Nome**: {project_name}
 - **Tipo**: {result.get('project_type', 'Unknown')}
-- **Data da Análise**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+- **Data da Análise**: {now.strftime("%Y-%m-%d %H:%M:%S")}
 - **Arquivos Escaneados**: {result.get('total_files_scanned', 0)}
 - **Campos CNPJ Encontrados**: {len(result.get('cnpj_fields_found', []))}
 
@@ -371,59 +707,48 @@ Houve um erro ao gerar o relatório completo: {e}
 
 Consulte o arquivo JSON para mais detalhes.
 """
-                with open(md_file, 'w', encoding='utf-8') as f:
-                    f.write(basic_content)
-            
-            self.console.print(f"Relatório salvo em: {output_dir}")
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao salvar relatório: {e}")
+            md_file.write_text(basic_content, encoding='utf-8')
 
-    def _generate_markdown_report(self, result: Dict[str, Any], output_file: Path):
+    def _generate_markdown_report(self, result: Dict[str, Any], output_file: Path, now: Optional[datetime] = None):
         """Gera relatório Markdown formatado com resumo no topo e arquivos categorizados"""
         try:
+            if now is None:
+                now = datetime.now()
             project_name = result.get('project_name', 'Unknown')
             project_type = result.get('project_type', 'Unknown')
             total_files = result.get('total_files_scanned', 0)
-            cnpj_fields = result.get('cnpj_fields_found', [])
+            files_skipped = result.get('files_skipped', [])
+            cnpj_fields = self._normalize_fields(result.get('cnpj_fields_found', []))
             validations = result.get('validations', [])
             masks = result.get('frontend_masks', [])
             
-            try:
-                impact = self._determine_overall_impact(result)
-                impact_str = impact.value if hasattr(impact, 'value') else str(impact)
-            except Exception as e:
-                self.logger.error(f"Erro ao determinar impacto: {e}")
-                impact_str = "MEDIUM"
-            
-            # Contar campos por nível de impacto
-            impact_counts = {'baixo': 0, 'medio': 0, 'alto': 0, 'critico': 0}
-            for field in cnpj_fields:
-                if isinstance(field, dict):
-                    impact_level = field.get('impact_level', 'medio').lower()
-                    impact_counts[impact_level] = impact_counts.get(impact_level, 0) + 1
-                elif hasattr(field, 'impact_level'):
-                    impact_level = field.impact_level.value.lower()
-                    impact_counts[impact_level] = impact_counts.get(impact_level, 0) + 1
-            
-            # Categorizar campos por tipo de arquivo
-            categorized_fields = self._categorize_fields(cnpj_fields)
+            # Impacto, contagens, categorias e campos críticos em uma única passada
+            scan = self._scan_fields(cnpj_fields)
+            impact_str = scan.overall_impact.value
+            impact_counts = scan.impact_counts
+            categorized_fields = scan.categorized
             
             # Contar validações e máscaras das subcategorias
             code_fields = categorized_fields.get('code', {})
             validation_count = len(code_fields.get('validations', []))
             mask_count = len(code_fields.get('frontend_masks', []))
             
-            report_content = f"""# Relatório de Análise CNPJ Alfanumérico
+            # Arquivos acima de --max-file-size ficam fora da análise e precisam
+            # aparecer no resumo
+            skipped_line = ''
+            if files_skipped:
+                skipped_line = f"- **⚠️ Arquivos Não Analisados (acima do tamanho máximo)**: {len(files_skipped)}\n"
+            
+            parts = [f"""# Relatório de Análise CNPJ Alfanumérico
 
 ## 📋 RESUMO EXECUTIVO
 
 ### Informações do Projeto
 - **Nome**: {project_name}
 - **Tipo**: {project_type}
-- **Data da Análise**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+- **Data da Análise**: {now.strftime('%Y-%m-%d %H:%M:%S')}
 - **Total de Arquivos Escaneados**: {total_files}
-
+{skipped_line}
 ### Impacto Geral
 - **Nível de Impacto**: {impact_str.upper()}
 - **Total de Campos CNPJ**: {len(cnpj_fields)}
@@ -448,41 +773,26 @@ Consulte o arquivo JSON para mais detalhes.
 
 ## 🚨 CAMPOS CRÍTICOS (Requerem Ação Imediata)
 
-"""
+"""]
+            # Métodos ligados uma vez para os laços de linhas das tabelas
+            append = parts.append
+            critical_row = _CRITICAL_ROW.__mod__
+            field_row = _FIELD_ROW.__mod__
             
             # Listar campos críticos primeiro
-            critical_fields = []
-            for field in cnpj_fields:
-                if isinstance(field, dict) and field.get('impact_level', '').lower() == 'critico':
-                    critical_fields.append(field)
-                elif hasattr(field, 'impact_level') and field.impact_level.value.lower() == 'critico':
-                    critical_fields.append(field)
+            critical_fields = scan.critical_fields
             
             if critical_fields:
-                report_content += "| Arquivo | Linha | Campo | Tipo | Tamanho | Status | Ação Necessária |\n"
-                report_content += "|---------|-------|-------|------|---------|--------|-----------------|\n"
+                append("| Arquivo | Linha | Campo | Tipo | Tamanho | Status | Ação Necessária |\n")
+                append("|---------|-------|-------|------|---------|--------|-----------------|\n")
                 
                 for field in critical_fields:
-                    if isinstance(field, dict):
-                        file_path = field.get('file_path', 'Unknown')
-                        line_number = field.get('line_number', '?')
-                        field_name = field.get('field_name', 'Unknown')
-                        field_type = field.get('field_type', 'Unknown')
-                        field_size = field.get('field_size', 'N/A')
-                        status = field.get('status', 'precisa_analise')
-                        action_needed = field.get('action_needed', 'Análise manual necessária')
-                    else:
-                        file_path = field.file_path
-                        line_number = field.line_number
-                        field_name = field.field_name
-                        field_type = field.field_type
-                        field_size = field.field_size or 'N/A'
-                        status = field.status.value
-                        action_needed = field.action_needed
-                    
-                    report_content += f"| {file_path} | {line_number} | {field_name} | {field_type} | {field_size} | {status} | {action_needed} |\n"
+                    append(critical_row((
+                        field['file_path'], field['line_number'], field['field_name'], field['field_type'],
+                        field['field_size'] or 'N/A', field['status'], field['action_needed']
+                    )))
             else:
-                report_content += "*Nenhum campo crítico encontrado.*\n"
+                append("*Nenhum campo crítico encontrado.*\n")
             
             # Adicionar campos por categoria
             for category, fields in categorized_fields.items():
@@ -491,76 +801,35 @@ Consulte o arquivo JSON para mais detalhes.
                     for subcategory, subcategory_fields in fields.items():
                         if subcategory_fields:
                             subcategory_name = self._get_subcategory_name(subcategory)
-                            report_content += f"\n## {subcategory_name}\n\n"
-                            report_content += "| Arquivo | Linha | Campo | Tipo | Tamanho | Impacto | Status | Ação Necessária | Esforço Estimado |\n"
-                            report_content += "|---------|-------|-------|------|---------|---------|--------|-----------------|------------------|\n"
+                            append(f"\n## {subcategory_name}\n\n")
+                            append("| Arquivo | Linha | Campo | Tipo | Tamanho | Impacto | Status | Ação Necessária | Esforço Estimado |\n")
+                            append("|---------|-------|-------|------|---------|---------|--------|-----------------|------------------|\n")
                             
                             for field in subcategory_fields:
-                                if isinstance(field, dict):
-                                    file_path = field.get('file_path', 'Unknown')
-                                    line_number = field.get('line_number', '?')
-                                    field_name = field.get('field_name', 'Unknown')
-                                    field_type = field.get('field_type', 'Unknown')
-                                    field_size = field.get('field_size', 'N/A')
-                                    impact_level = field.get('impact_level', 'medio')
-                                    status = field.get('status', 'precisa_analise')
-                                    action_needed = field.get('action_needed', 'Análise manual necessária')
-                                    estimated_effort = field.get('estimated_effort', 'A definir')
-                                else:
-                                    # Usar a interface CNPJFieldInterface
-                                    file_path = field.get_file_path()
-                                    line_number = field.get_line_number()
-                                    field_name = field.get_field_name()
-                                    field_type = field.get_field_type()
-                                    field_size = field.field_size or 'N/A'
-                                    impact_level = field.get_impact_level()
-                                    status = field.get_status()
-                                    action_needed = field.get_action_needed()
-                                    estimated_effort = field.get_estimated_effort()
-                                
-                                report_content += f"| {file_path} | {line_number} | {field_name} | {field_type} | {field_size} | {impact_level} | {status} | {action_needed} | {estimated_effort} |\n"
+                                append(field_row((
+                                    field['file_path'], field['line_number'], field['field_name'], field['field_type'],
+                                    field['field_size'] or 'N/A', field['impact_level'], field['status'],
+                                    field['action_needed'], field['estimated_effort']
+                                )))
                 else:
                     # Processar outras categorias normalmente
                     if fields:
-                        category_name = {
-                            'migrations': '📁 MIGRAÇÕES',
-                            'tests': '🧪 TESTES',
-                            'etl': '🗄️ ETL',
-                            'others': '📄 OUTROS'
-                        }.get(category, category.upper())
+                        category_name = _CATEGORY_NAMES.get(category, category.upper())
                         
-                        report_content += f"\n## {category_name}\n\n"
-                        report_content += "| Arquivo | Linha | Campo | Tipo | Tamanho | Impacto | Status | Ação Necessária | Esforço Estimado |\n"
-                        report_content += "|---------|-------|-------|------|---------|---------|--------|-----------------|------------------|\n"
+                        append(f"\n## {category_name}\n\n")
+                        append("| Arquivo | Linha | Campo | Tipo | Tamanho | Impacto | Status | Ação Necessária | Esforço Estimado |\n")
+                        append("|---------|-------|-------|------|---------|---------|--------|-----------------|------------------|\n")
                         
                         for field in fields:
-                            if isinstance(field, dict):
-                                file_path = field.get('file_path', 'Unknown')
-                                line_number = field.get('line_number', '?')
-                                field_name = field.get('field_name', 'Unknown')
-                                field_type = field.get('field_type', 'Unknown')
-                                field_size = field.get('field_size', 'N/A')
-                                impact_level = field.get('impact_level', 'medio')
-                                status = field.get('status', 'precisa_analise')
-                                action_needed = field.get('action_needed', 'Análise manual necessária')
-                                estimated_effort = field.get('estimated_effort', 'A definir')
-                            else:
-                                # Usar a interface CNPJFieldInterface
-                                file_path = field.get_file_path()
-                                line_number = field.get_line_number()
-                                field_name = field.get_field_name()
-                                field_type = field.get_field_type()
-                                field_size = field.field_size or 'N/A'
-                                impact_level = field.get_impact_level()
-                                status = field.get_status()
-                                action_needed = field.get_action_needed()
-                                estimated_effort = field.get_estimated_effort()
-                            
-                            report_content += f"| {file_path} | {line_number} | {field_name} | {field_type} | {field_size} | {impact_level} | {status} | {action_needed} | {estimated_effort} |\n"
+                            append(field_row((
+                                field['file_path'], field['line_number'], field['field_name'], field['field_type'],
+                                field['field_size'] or 'N/A', field['impact_level'], field['status'],
+                                field['action_needed'], field['estimated_effort']
+                            )))
             
             # Adicionar validações e máscaras no final
             if validations:
-                report_content += "\n## 🔍 VALIDAÇÕES ENCONTRADAS\n\n"
+                append("\n## 🔍 VALIDAÇÕES ENCONTRADAS\n\n")
                 for validation in validations[:20]:  # Limitar a 20
                     if isinstance(validation, dict):
                         file_path = validation.get('file_path', 'Unknown')
@@ -571,10 +840,10 @@ Consulte o arquivo JSON para mais detalhes.
                         file_path = validation.get_file_path()
                         line_number = validation.get_line_number()
                         line = validation.get_context()
-                    report_content += f"- {file_path}:{line_number} - {line}\n"
+                    append(f"- {file_path}:{line_number} - {line}\n")
             
             if masks:
-                report_content += "\n## 🎭 MÁSCARAS FRONTEND ENCONTRADAS\n\n"
+                append("\n## 🎭 MÁSCARAS FRONTEND ENCONTRADAS\n\n")
                 for mask in masks[:20]:  # Limitar a 20
                     if isinstance(mask, dict):
                         file_path = mask.get('file_path', 'Unknown')
@@ -585,17 +854,26 @@ Consulte o arquivo JSON para mais detalhes.
                         file_path = mask.get_file_path()
                         line_number = mask.get_line_number()
                         line = mask.get_context()
-                    report_content += f"- {file_path}:{line_number} - {line}\n"
+                    append(f"- {file_path}:{line_number} - {line}\n")
             
             # Salvar arquivo
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(report_content)
+            output_file.write_text("".join(parts), encoding='utf-8')
                 
         except Exception as e:
             self.logger.error(f"Erro ao gerar relatório Markdown: {e}")
 
-    def _categorize_fields(self, cnpj_fields: List) -> Dict[str, List]:
-        """Categoriza campos CNPJ por tipo de arquivo e subcategorias"""
+    def _scan_fields(self, cnpj_fields: List[Dict[str, Any]]) -> FieldScan:
+        """Percorre os campos CNPJ (já normalizados) uma única vez
+        
+        Conta os níveis de impacto, determina o impacto geral, separa os campos
+        críticos e categoriza por tipo de arquivo e subcategorias.
+        """
+        impact_counts = {'baixo': 0, 'medio': 0, 'alto': 0, 'critico': 0}
+        critical_fields = []
+        best = ImpactLevel.LOW
+        best_rank = 0
+        impact_from_keyword = self._impact_from_keyword
+        
         categorized = {
             'migrations': [],
             'code': {
@@ -616,30 +894,42 @@ Consulte o arquivo JSON para mais detalhes.
         }
         
         for field in cnpj_fields:
-            if isinstance(field, dict):
-                file_path = field.get('file_path', '')
-                field_type = field.get('field_type', '')
-            else:
-                file_path = field.file_path
-                field_type = field.field_type
+            # Impacto
+            impact_level = field['impact_level']
+            impact_lower = impact_level.casefold()
+            impact_counts[impact_lower] = impact_counts.get(impact_lower, 0) + 1
+            if impact_lower in _CRITICAL_TAGS:
+                critical_fields.append(field)
+            level = impact_from_keyword(impact_level)
+            rank = _IMPACT_RANK[level]
+            if rank > best_rank:
+                best, best_rank = level, rank
             
-            file_path_lower = file_path.lower()
+            # Categoria
+            file_path = field['file_path']
+            field_type = field['field_type']
+            file_path_lower = field['_file_path_lower']
             
             # Detectar arquivos de teste primeiro
-            if any(test_pattern in file_path_lower for test_pattern in ['test', 'tests', 'spec', 'specs', 'phpunit', 'jest', 'junit']):
+            if _test_search(file_path_lower):
                 categorized['tests'].append(field)
-            elif 'migration' in file_path_lower or 'migrations' in file_path_lower:
+            elif _migration_search(file_path_lower):
                 categorized['migrations'].append(field)
-            elif any(ext in file_path_lower for ext in ['.ktr', '.kjb', '.xml', 'pentaho', 'etl']):
+            elif _etl_search(file_path_lower):
                 categorized['etl'].append(field)
-            elif any(ext in file_path_lower for ext in ['.php', '.js', '.ts', '.jsx', '.tsx', '.vue', '.py', '.java']):
+            elif _code_search(file_path_lower):
                 # Subcategorizar código
                 subcategory = self._determine_code_subcategory(file_path, field_type, file_path_lower)
                 categorized['code'][subcategory].append(field)
             else:
                 categorized['others'].append(field)
         
-        return categorized
+        return FieldScan(
+            impact_counts=impact_counts,
+            categorized=categorized,
+            critical_fields=critical_fields,
+            overall_impact=best
+        )
 
     def _determine_code_subcategory(self, file_path: str, field_type: str, file_path_lower: str) -> str:
         """Determina a subcategoria de um campo de código"""
@@ -652,97 +942,128 @@ Consulte o arquivo JSON para mais detalhes.
         if field_type in ['MASK_FUNCTION', 'INPUT_MASK']:
             return 'frontend_masks'
         
-        # Repositories
-        if any(pattern in file_path_lower for pattern in ['repository', 'repo', 'dao', 'dataaccess']):
-            return 'repositories'
-        
-        # Interfaces
-        if any(pattern in file_path_lower for pattern in ['interface', 'contract', 'abstract']):
-            return 'interfaces'
-        
-        # Services
-        if any(pattern in file_path_lower for pattern in ['service', 'business', 'facade']):
-            return 'services'
-        
-        # Controllers
-        if any(pattern in file_path_lower for pattern in ['controller', 'handler', 'action']):
-            return 'controllers'
-        
-        # Models
-        if any(pattern in file_path_lower for pattern in ['model', 'entity', 'dto', 'vo']):
-            return 'models'
-        
-        # Components (UI)
-        if any(pattern in file_path_lower for pattern in ['component', 'molecule', 'atom', 'organism']):
-            return 'components'
-        
-        # Utils/Helpers
-        if any(pattern in file_path_lower for pattern in ['util', 'helper', 'helper', 'mixin', 'utility']):
-            return 'utils'
-        
-        # Outros códigos
-        return 'other_code'
+        # Repositories, interfaces, services, ... (na ordem de prioridade)
+        return _match_code_subcategory(file_path_lower)
 
     def _count_code_fields(self, code_fields: Dict) -> int:
         """Conta o total de campos de código em todas as subcategorias"""
-        total = 0
-        for subcategory_fields in code_fields.values():
-            total += len(subcategory_fields)
-        return total
+        return sum(map(len, code_fields.values()))
 
     def _format_code_subcategories(self, code_fields: Dict) -> str:
         """Formata as subcategorias de código para exibição"""
-        subcategories_text = ""
-        subcategory_names = {
-            'validations': '🔍 Validações',
-            'frontend_masks': '🎭 Máscaras Frontend',
-            'repositories': '🗄️ Repositories',
-            'interfaces': '📋 Interfaces',
-            'services': '⚙️ Services',
-            'controllers': '🎮 Controllers',
-            'models': '📊 Models',
-            'components': '🧩 Components',
-            'utils': '🔧 Utils/Helpers',
-            'other_code': '💻 Outros Códigos'
-        }
+        lines = [
+            f"- **{_SUBCATEGORY_NAMES.get(subcategory, subcategory.title())}**: {len(fields)} campos\n"
+            for subcategory, fields in code_fields.items()
+            if fields
+        ]
         
-        for subcategory, fields in code_fields.items():
-            if fields:
-                subcategory_name = subcategory_names.get(subcategory, subcategory.title())
-                subcategories_text += f"- **{subcategory_name}**: {len(fields)} campos\n"
-        
-        return subcategories_text if subcategories_text else "- *Nenhuma subcategoria encontrada*"
+        return "".join(lines) if lines else "- *Nenhuma subcategoria encontrada*"
 
     def _get_subcategory_name(self, subcategory: str) -> str:
         """Retorna o nome formatado da subcategoria"""
-        subcategory_names = {
-            'validations': '🔍 VALIDAÇÕES',
-            'frontend_masks': '🎭 MÁSCARAS FRONTEND',
-            'repositories': '🗄️ REPOSITORIES',
-            'interfaces': '📋 INTERFACES',
-            'services': '⚙️ SERVICES',
-            'controllers': '🎮 CONTROLLERS',
-            'models': '📊 MODELS',
-            'components': '🧩 COMPONENTS',
-            'utils': '🔧 UTILS/HELPERS',
-            'other_code': '💻 OUTROS CÓDIGOS'
-        }
-        return subcategory_names.get(subcategory, subcategory.upper())
+        return _SUBCATEGORY_TITLES.get(subcategory, subcategory.upper())
 
     def get_supported_types(self) -> Dict[str, str]:
         """Retorna os tipos de projeto suportados"""
         return self.factory.get_supported_types()
 
+class _LogRelayHandler(logging.Handler):
+    """Entrega ao logging do processo principal os registros vindos dos workers"""
+    
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+def _init_worker(log_queue) -> None:
+    """Prepara um processo worker do analyze_all (initializer do pool)
+    
+    O console do rich é silenciado (a saída padrão é descartada a cada
+    projeto por _analyze_single_project): as mensagens se misturariam, no
+    meio da linha, às dos outros workers e à barra de progresso. O logging
+    vai para a fila lida pelo processo principal.
+    """
+    console.quiet = True
+    
+    # Sem formatter: a mensagem é formatada uma única vez, no processo principal
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+def _analyze_single_project(project: Dict[str, Any], filters: Optional[Dict]) -> Dict[str, Any]:
+    """Analisa um projeto individual em um processo worker
+    
+    Função de módulo (picklable) para uso com ProcessPoolExecutor. Os print
+    dos analisadores são descartados durante a análise (o console do rich já
+    é silenciado por _init_worker): devolve um dicionário de status que o
+    processo principal exibe e cujo relatório é gravado pela thread de
+    escrita, e o logging segue pela fila para o processo principal.
+    """
+    status = {'name': project['name'], 'result': None, 'impact': None, 'impact_error': None, 'error': None}
+    project_path = Path(project['path'])
+    
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result = analyzer.analyze_project(project_path, project_type=project['type'], filters=filters)
+        result['project_name'] = project['name']
+        result['project_path'] = project['path']
+        status['result'] = result
+        
+        # Verificar se houve erro na análise
+        if 'error' in result and result['error']:
+            status['error'] = result['error']
+            return status
+        
+        # Determinar impacto geral
+        try:
+            impact: ImpactLevel = analyzer._determine_overall_impact(result)
+            status['impact'] = impact.value
+        except Exception as e:
+            status['impact_error'] = str(e)
+        
+    except Exception as e:
+        status['result'] = None
+        status['error'] = str(e)
+    
+    return status
+
 # Instância global
 analyzer = CNPJAnalyzerModular()
 
+def _build_filters(skip_tests: bool, focus_migrations: bool, cache_dir: Optional[str] = None,
+                   max_file_size: Optional[int] = None) -> Dict[str, Any]:
+    """Monta os filtros de análise a partir das opções da linha de comando"""
+    filters = {}
+    if skip_tests:
+        filters['skip_patterns'] = _SKIP_TEST_PATTERNS
+    if focus_migrations:
+        filters['include_patterns'] = _MIGRATION_PATTERNS
+    if cache_dir:
+        # Resultados por arquivo em disco: arquivos inalterados não são
+        # reanalisados nas execuções seguintes
+        filters['cache_dir'] = cache_dir
+    if max_file_size is not None:
+        # Substitui o limite de cada analisador (0 desativa)
+        filters['max_file_size'] = max_file_size
+    return filters
+
+def _resolve_projects_folder(projects_folder: Optional[str]) -> Path:
+    """Retorna a pasta de projetos informada ou a de PROJECTS_FOLDER"""
+    if projects_folder is None:
+        projects_folder = os.getenv('PROJECTS_FOLDER')
+        if not projects_folder:
+            console.print("[red]Erro: Especifique --projects-folder ou configure PROJECTS_FOLDER[/red]")
+            raise typer.Exit(1)
+    
+    return Path(projects_folder)
+
 @app.command()
 def analyze(
     project_path: str = typer.Argument(..., help="Caminho para o projeto a ser analisado"),
     project_type: Optional[str] = typer.Option(None, help="Tipo de projeto (detectado automaticamente se não especificado)"),
     output: str = typer.Option("reports/", help="Diretório de saída para relatórios"),
     skip_tests: bool = typer.Option(False, help="Ignorar pastas de testes"),
-    focus_migrations: bool = typer.Option(False, help="Focar apenas em arquivos de migração")
+    focus_migrations: bool = typer.Option(False, help="Focar apenas em arquivos de migração"),
+    cache_dir: Optional[str] = typer.Option(None, help="Diretório de cache dos resultados por arquivo (reexecuções só reanalisam arquivos alterados; apague-o para descartar o cache)"),
+    max_file_size: Optional[int] = typer.Option(None, help="Tamanho máximo, em bytes, dos arquivos analisados (0 desativa; padrão: 2 MiB, sem limite para ETL)")
 ):
     """Analisa um projeto específico"""
     project_path = Path(project_path)
@@ -754,12 +1075,7 @@ def analyze(
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Configurar filtros
-    filters = {}
-    if skip_tests:
-        filters['skip_patterns'] = ['tests', 'Tests', 'test', 'Test']
-    if focus_migrations:
-        filters['include_patterns'] = ['migration', 'Migration', 'migrations', 'Migrations']
+    filters = _build_filters(skip_tests, focus_migrations, cache_dir, max_file_size)
     
     result = analyzer.analyze_project(project_path, project_type, filters)
     analyzer._save_individual_report(result, output_dir)
@@ -770,16 +1086,12 @@ def analyze_all(
     output: str = typer.Option("reports/", help="Diretório de saída para relatórios"),
     workers: int = typer.Option(4, help="Número de workers para análise paralela"),
     skip_tests: bool = typer.Option(False, help="Ignorar pastas de testes"),
-    focus_migrations: bool = typer.Option(False, help="Focar apenas em arquivos de migração")
+    focus_migrations: bool = typer.Option(False, help="Focar apenas em arquivos de migração"),
+    cache_dir: Optional[str] = typer.Option(None, help="Diretório de cache dos resultados por arquivo (reexecuções só reanalisam arquivos alterados; apague-o para descartar o cache)"),
+    max_file_size: Optional[int] = typer.Option(None, help="Tamanho máximo, em bytes, dos arquivos analisados (0 desativa; padrão: 2 MiB, sem limite para ETL)")
 ):
-    """Analisa todos os projetos em uma pasta usando multithreading"""
-    if projects_folder is None:
-        projects_folder = os.getenv('PROJECTS_FOLDER')
-        if not projects_folder:
-            console.print("[red]Erro: Especifique --projects-folder ou configure PROJECTS_FOLDER[/red]")
-            raise typer.Exit(1)
-    
-    projects_folder = Path(projects_folder)
+    """Analisa todos os projetos em uma pasta usando múltiplos processos"""
+    projects_folder = _resolve_projects_folder(projects_folder)
     output_dir = Path(output)
     
     if not projects_folder.exists():
@@ -788,12 +1100,7 @@ def analyze_all(
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Configurar filtros
-    filters = {}
-    if skip_tests:
-        filters['skip_patterns'] = ['tests', 'Tests', 'test', 'Test']
-    if focus_migrations:
-        filters['include_patterns'] = ['migration', 'Migration', 'migrations', 'Migrations']
+    filters = _build_filters(skip_tests, focus_migrations, cache_dir, max_file_size)
     
     results = analyzer.analyze_all_projects(projects_folder, output_dir, workers, filters)
 
@@ -802,13 +1109,7 @@ def discover_projects(
     projects_folder: Optional[str] = typer.Option(None, help="Pasta contendo projetos (usa PROJECTS_FOLDER se não especificado)")
 ):
     """Descobre projetos em uma pasta"""
-    if projects_folder is None:
-        projects_folder = os.getenv('PROJECTS_FOLDER')
-        if not projects_folder:
-            console.print("[red]Erro: Especifique --projects-folder ou configure PROJECTS_FOLDER[/red]")
-            raise typer.Exit(1)
-    
-    projects_folder = Path(projects_folder)
+    projects_folder = _resolve_projects_folder(projects_folder)
     projects = analyzer.discover_projects(projects_folder)
     
     if projects:
@@ -839,7 +1140,7 @@ def list_types():
 @app.command()
 def general_analysis(reports_dir: str = typer.Option("reports/", help="Diretório com relatórios de projetos")):
     """Gera relatório geral de todos os projetos analisados"""
-    from src.application.general_analyzer import GeneralAnalyzer
+    GeneralAnalyzer = _general_analyzer_class()
     
     print("🔍 Gerando relatório geral...")
     
@@ -869,12 +1170,10 @@ def general_analysis(reports_dir: str = typer.Option("reports/", help="Diretóri
 @app.command()
 def export_powerpoint(reports_dir: str = typer.Option("reports/", help="Diretório com relatórios de projetos")):
     """Exporta relatório geral para PowerPoint"""
-    from src.exporters.presentation_exporter import PresentationExporter
-    
     print("📊 Gerando apresentação PowerPoint...")
     
     try:
-        exporter = PresentationExporter(reports_dir)
+        exporter = _exporter(reports_dir)
         output_file = exporter.export_to_powerpoint()
         
         print(f"✅ Apresentação PowerPoint salva em: {output_file}")
@@ -890,12 +1189,10 @@ def export_powerpoint(reports_dir: str = typer.Option("reports/", help="Diretór
 @app.command()
 def export_pdf(reports_dir: str = typer.Option("reports/", help="Diretório com relatórios de projetos")):
     """Exporta relatório geral para PDF"""
-    from src.exporters.presentation_exporter import PresentationExporter
-    
     print("📄 Gerando relatório PDF...")
     
     try:
-        exporter = PresentationExporter(reports_dir)
+        exporter = _exporter(reports_dir)
         output_file = exporter.export_to_pdf()
         
         print(f"✅ Relatório PDF salvo em: {output_file}")
@@ -911,12 +1208,10 @@ def export_pdf(reports_dir: str = typer.Option("reports/", help="Diretório com
 @app.command()
 def export_all(reports_dir: str = typer.Option("reports/", help="Diretório com relatórios de projetos")):
     """Exporta relatório geral para PowerPoint e PDF"""
-    from src.exporters.presentation_exporter import PresentationExporter
-    
     print("🚀 Gerando todas as exportações...")
     
     try:
-        exporter = PresentationExporter(reports_dir)
+        exporter = _exporter(reports_dir)
         
         # Gerar PowerPoint
         print("📊 Gerando apresentação PowerPoint...")
@@ -5,8 +5,22 @@ Data: 2025-08-28
 """
 
 import json
+import os
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 from application.base_analyzer import BaseAnalyzer
 from application.php_analyzer import PHPAnalyzer
@@ -14,9 +28,68 @@ from application.ui_analyzer import UIAnalyzer
 from application.nest_analyzer import NestAnalyzer
 from application.etl_analyzer import ETLAnalyzer
 
+# Manifestos a partir deste tamanho são lidos em streaming (ijson), guardando
+# apenas as chaves usadas na detecção do tipo de projeto
+_MANIFEST_STREAM_BYTES = 1024 * 1024
+_MANIFEST_KEYS = frozenset({'require', 'require-dev', 'dependencies', 'devDependencies', 'scripts'})
+
+# Sniff de arquivos Python ETL: um grupo por tipo, em ordem de prioridade
+_PYTHON_SNIFF_BYTES = 64 * 1024
+_ETL_PYTHON_RE = re.compile(rb'(pyspark|SparkSession)|(airflow|DAG)|(pandas|pd\.|df\.)')
+_ETL_PYTHON_HIGHER_RE = {
+    2: re.compile(rb'(pyspark|SparkSession)'),
+    3: re.compile(rb'(pyspark|SparkSession)|(airflow|DAG)')
+}
+_ETL_PYTHON_TYPES = {
+    1: 'etl_python_spark',
+    2: 'etl_python_airflow',
+    3: 'etl_python_pandas'
+}
+
+# Palavras-chave de package.json. 'react-native' vem antes de 'react' na
+# alternação para que a ocorrência mais longa seja a registrada
+_NODE_DEPS_RE = re.compile(r'react-native|@nestjs|@angular|react|vue')
+_NODE_SCRIPTS_RE = re.compile(r'react-native|nest|react|vue|angular')
+_NODE_DEPS_PRIORITY = (
+    ('react-native', 'ui_react_native'),
+    ('@nestjs', 'nest_bff'),
+    ('react', 'ui_react'),
+    ('vue', 'ui_vue'),
+    ('@angular', 'ui_angular')
+)
+_NODE_SCRIPTS_PRIORITY = (
+    ('react-native', 'ui_react_native'),
+    ('nest', 'nest_bff'),
+    ('react', 'ui_react'),
+    ('vue', 'ui_vue'),
+    ('angular', 'ui_angular')
+)
+
 class AnalyzerFactory:
     """Factory para criar analisadores específicos por tipo de projeto"""
     
+    # Extensões que caracterizam um projeto ETL
+    ETL_EXTENSIONS = ('.ktr', '.kjb', '.sql', '.py', '.r', '.scala', '.java')
+    
+    # Extensão (minúscula, sem ponto) -> tipo ETL indicado
+    ETL_EXTENSION_KINDS = {
+        'ktr': 'etl_pentaho',
+        'kjb': 'etl_pentaho',
+        'sql': 'etl_sql',
+        'py': 'python',
+        'r': 'etl_r',
+        'scala': 'etl_scala_java',
+        'java': 'etl_scala_java'
+    }
+    
+    # Prefixo do tipo -> analisador genérico, para tipos sem entrada própria
+    FALLBACK_ANALYZERS = (
+        ('php', lambda: PHPAnalyzer('php')),
+        ('ui', lambda: UIAnalyzer('ui')),
+        ('nest', lambda: NestAnalyzer()),
+        ('etl', lambda: ETLAnalyzer())
+    )
+    
     def __init__(self):
         self.analyzers = {
             # PHP Projects
@@ -46,152 +119,300 @@ class AnalyzerFactory:
             'etl_scala_java': lambda: ETLAnalyzer(),
             'etl_generic': lambda: ETLAnalyzer()
         }
+        
+        # Analisadores já criados, por tipo de projeto
+        self._instances: Dict[str, BaseAnalyzer] = {}
+        
+        # Detecções e manifestos já lidos; as chaves incluem mtime (e tamanho),
+        # então uma alteração gera uma nova entrada em vez de reusar a antiga
+        self._detect_cache: Dict[tuple, str] = {}
+        self._manifest_cache: Dict[tuple, Dict[str, Any]] = {}
 
     def create_analyzer(self, project_type: str) -> BaseAnalyzer:
+        """Retorna o analisador do tipo de projeto
+        
+        Os analisadores não guardam estado entre projetos (o caminho é passado
+        a cada análise), então cada tipo é instanciado uma única vez.
+        """
+        analyzer = self._instances.get(project_type)
+        if analyzer is None:
+            analyzer = self._instances[project_type] = self._build_analyzer(project_type)
+        return analyzer
+
+    def _build_analyzer(self, project_type: str) -> BaseAnalyzer:
         """Cria um analisador baseado no tipo de projeto"""
         if project_type in self.analyzers:
             return self.analyzers[project_type]()
-        else:
-            # Fallback para analisador genérico baseado no prefixo
-            if project_type.startswith('php'):
-                return PHPAnalyzer('php')
-            elif project_type.startswith('ui'):
-                return UIAnalyzer('ui')
-            elif project_type.startswith('nest'):
-                return NestAnalyzer()
-            elif project_type.startswith('etl'):
-                return ETLAnalyzer()
-            else:
-                return PHPAnalyzer('php')
+        
+        # Fallback para analisador genérico baseado no prefixo
+        for prefix, build in self.FALLBACK_ANALYZERS:
+            if project_type.startswith(prefix):
+                return build()
+        return PHPAnalyzer('php')
 
-    def detect_project_type(self, project_path: Path) -> str:
-        """Detecta automaticamente o tipo de projeto"""
-        if not project_path.exists():
+    def detect_project_type(self, project_path: Path, names=None) -> str:
+        """Detecta automaticamente o tipo de projeto
+        
+        names é a listagem do primeiro nível, se o chamador já a tiver; assim a
+        pasta não é listada de novo.
+        
+        O resultado é memorizado por caminho absoluto, mtime do diretório e
+        (mtime, tamanho) de composer.json e package.json: criar ou remover
+        arquivos na raiz, ou editar um dos manifestos, invalida a entrada.
+        Alterações apenas em subpastas não mudam a chave; o tipo ETL decidido
+        por elas só é recalculado em uma nova factory (nova execução).
+        """
+        path_str = os.path.abspath(project_path)
+        try:
+            mtime_ns = os.stat(path_str).st_mtime_ns
+        except OSError:
             return 'unknown'
         
-        # Verificar composer.json (PHP)
-        composer_path = project_path / 'composer.json'
-        if composer_path.exists():
-            try:
-                with open(composer_path, 'r', encoding='utf-8') as f:
-                    composer_data = json.load(f)
-                
-                dependencies = composer_data.get('require', {})
-                dev_dependencies = composer_data.get('require-dev', {})
-                all_deps = {**dependencies, **dev_dependencies}
-                
-                # Detectar Laravel
-                if 'laravel/framework' in all_deps:
-                    return 'php_laravel'
-                # Detectar Symfony (prioridade sobre Laravel components)
-                elif any('symfony' in dep.lower() for dep in all_deps.keys()):
-                    return 'php_symfony'
-                # Detectar Hyperf
-                elif any('hyperf' in dep for dep in all_deps.keys()):
-                    return 'php_hyperf'
-                else:
-                    return 'php_generic'
-            except (json.JSONDecodeError, FileNotFoundError):
-                return 'php_generic'
+        key = (path_str, mtime_ns) + tuple(
+            self._manifest_stamp(os.path.join(path_str, name))
+            for name in ('composer.json', 'package.json')
+        )
+        project_type = self._detect_cache.get(key)
+        if project_type is None:
+            project_type = self._detect_cache[key] = self._detect_uncached(path_str, names)
+        return project_type
+
+    @staticmethod
+    def _manifest_stamp(manifest_path: str) -> Optional[tuple]:
+        """(mtime, tamanho) de um manifesto, ou None se ele não existir"""
+        try:
+            stat = os.stat(manifest_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _detect_uncached(self, path_str: str, names=None) -> str:
+        """Detecção sem cache; chamada apenas por detect_project_type"""
+        project_path = Path(path_str)
         
-        # Verificar package.json (Node.js)
-        package_path = project_path / 'package.json'
-        if package_path.exists():
+        # Uma listagem da raiz substitui os exists() de composer.json e
+        # package.json (PHP e Node.js)
+        if names is None:
             try:
-                with open(package_path, 'r', encoding='utf-8') as f:
-                    package_data = json.load(f)
-                
-                dependencies = package_data.get('dependencies', {})
-                dev_dependencies = package_data.get('devDependencies', {})
-                all_deps = {**dependencies, **dev_dependencies}
-                scripts = package_data.get('scripts', {})
-                
-                # Detectar React Native
-                if any('react-native' in dep for dep in all_deps.keys()):
-                    return 'ui_react_native'
-                # Detectar NestJS
-                elif any('@nestjs' in dep for dep in all_deps.keys()):
-                    return 'nest_bff'
-                # Detectar React
-                elif any('react' in dep for dep in all_deps.keys()):
-                    return 'ui_react'
-                # Detectar Vue
-                elif any('vue' in dep for dep in all_deps.keys()):
-                    return 'ui_vue'
-                # Detectar Angular
-                elif any('@angular' in dep for dep in all_deps.keys()):
-                    return 'ui_angular'
-                # Verificar scripts para detecção adicional
-                elif any('react-native' in str(v).lower() for v in scripts.values()):
-                    return 'ui_react_native'
-                elif any('nest' in str(v).lower() for v in scripts.values()):
-                    return 'nest_bff'
-                elif any('react' in str(v).lower() for v in scripts.values()):
-                    return 'ui_react'
-                elif any('vue' in str(v).lower() for v in scripts.values()):
-                    return 'ui_vue'
-                elif any('angular' in str(v).lower() for v in scripts.values()):
-                    return 'ui_angular'
-                else:
-                    return 'ui_generic'
-            except (json.JSONDecodeError, FileNotFoundError):
-                return 'ui_generic'
-        
-        # Verificar arquivos ETL
+                with os.scandir(path_str) as entries:
+                    names = [entry.name for entry in entries]
+            except OSError:
+                return 'unknown'
+        
+        project_type = self.detect_project_type_from_names(project_path, names)
+        if project_type is not None:
+            return project_type
+        
+        # Verificar arquivos ETL em subpastas
         if self._is_etl_project(project_path):
             return self._detect_etl_type(project_path)
         
         return 'unknown'
 
-    def _is_etl_project(self, project_path: Path) -> bool:
-        """Verifica se o projeto é um projeto ETL"""
-        etl_extensions = ['.ktr', '.kjb', '.sql', '.py', '.r', '.scala', '.java']
-        etl_files = []
+    def detect_project_type_from_names(self, project_path: Path, names) -> Optional[str]:
+        """Detecta o tipo de projeto a partir dos nomes de primeiro nível
         
-        for ext in etl_extensions:
-            etl_files.extend(project_path.rglob(f'*{ext}'))
+        Usa a listagem já obtida do diretório para evitar os stat() de
+        detect_project_type. Retorna None quando só a varredura completa
+        (arquivos ETL em subpastas) pode decidir.
+        """
+        if not names:
+            return 'unknown'
         
-        return len(etl_files) > 0
+        if 'composer.json' in names:
+            return self._detect_php_type(project_path / 'composer.json')
+        
+        if 'package.json' in names:
+            return self._detect_node_type(project_path / 'package.json')
+        
+        # Arquivo ETL na raiz já confirma o projeto ETL (sem _is_etl_project);
+        # o tipo específico ainda depende da varredura de _detect_etl_type
+        if any(name.endswith(self.ETL_EXTENSIONS) for name in names):
+            return self._detect_etl_type(project_path)
+        
+        return None
+
+    def _load_manifest(self, manifest_path: Path) -> Dict[str, Any]:
+        """Lê um composer.json/package.json, reaproveitando leituras anteriores"""
+        path_str = os.fspath(manifest_path)
+        stat = os.stat(path_str)
+        key = (path_str, stat.st_mtime_ns, stat.st_size)
+        data = self._manifest_cache.get(key)
+        if data is None:
+            data = self._manifest_cache[key] = self._read_manifest(path_str, stat.st_size)
+        return data
+
+    def _read_manifest(self, path_str: str, size: int) -> Dict[str, Any]:
+        """Leitura sem cache; o resultado é compartilhado e não deve ser alterado"""
+        if IJSON_AVAILABLE and size >= _MANIFEST_STREAM_BYTES:
+            return self._stream_manifest(path_str)
+        with open(path_str, 'rb') as f:
+            data = f.read()
+        # Ambos aceitam bytes diretamente; orjson.JSONDecodeError herda de
+        # json.JSONDecodeError
+        return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+    def _stream_manifest(self, path_str: str) -> Dict[str, Any]:
+        """Lê apenas as chaves de _MANIFEST_KEYS de um manifesto grande"""
+        try:
+            with open(path_str, 'rb') as f:
+                return {
+                    key: value
+                    for key, value in ijson.kvitems(f, '')
+                    if key in _MANIFEST_KEYS
+                }
+        except ijson.JSONError as e:
+            # Mesma exceção da leitura completa, tratada pelos chamadores
+            raise json.JSONDecodeError(str(e), path_str, 0) from e
+
+    def _detect_php_type(self, composer_path: Path) -> str:
+        """Detecta o framework PHP a partir do composer.json"""
+        try:
+            composer_data = self._load_manifest(composer_path)
+            
+            dependencies = composer_data.get('require', {})
+            dev_dependencies = composer_data.get('require-dev', {})
+            all_deps = {**dependencies, **dev_dependencies}
+            
+            # Nomes das dependências em um único texto (uma por linha): cada
+            # verificação é uma só busca em vez de um laço sobre as chaves
+            deps_text = '\n'.join(all_deps)
+            
+            # Detectar Laravel
+            if 'laravel/framework' in all_deps:
+                return 'php_laravel'
+            # Detectar Symfony (prioridade sobre Laravel components)
+            elif 'symfony' in deps_text.lower():
+                return 'php_symfony'
+            # Detectar Hyperf
+            elif 'hyperf' in deps_text:
+                return 'php_hyperf'
+            else:
+                return 'php_generic'
+        except (json.JSONDecodeError, FileNotFoundError):
+            return 'php_generic'
+
+    def _detect_node_type(self, package_path: Path) -> str:
+        """Detecta o framework Node.js a partir do package.json"""
+        try:
+            package_data = self._load_manifest(package_path)
+            
+            dependencies = package_data.get('dependencies', {})
+            dev_dependencies = package_data.get('devDependencies', {})
+            all_deps = {**dependencies, **dev_dependencies}
+            scripts = package_data.get('scripts', {})
+            
+            # Uma passada sobre dependências e outra sobre scripts coletam todas
+            # as palavras-chave; a prioridade é aplicada sobre os conjuntos
+            dep_hits = set(_NODE_DEPS_RE.findall('\n'.join(all_deps)))
+            
+            # Dependências: React Native, NestJS, React, Vue, Angular
+            for keyword, project_type in _NODE_DEPS_PRIORITY:
+                if keyword in dep_hits:
+                    return project_type
+            
+            # Verificar scripts para detecção adicional
+            script_hits = set(_NODE_SCRIPTS_RE.findall('\n'.join(str(v).lower() for v in scripts.values())))
+            for keyword, project_type in _NODE_SCRIPTS_PRIORITY:
+                if keyword in script_hits:
+                    return project_type
+            return 'ui_generic'
+        except (json.JSONDecodeError, FileNotFoundError):
+            return 'ui_generic'
+
+    def _scandir_recursive(self, path) -> Iterator[os.DirEntry]:
+        """Percorre recursivamente um diretório com os.scandir
+        
+        Reaproveita o tipo da entrada retornado pelo sistema (DirEntry), sem
+        stat() extra por arquivo. Links simbólicos para diretórios não são
+        seguidos, como em Path.rglob.
+        """
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    yield entry
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self._scandir_recursive(entry.path)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            return
+
+    def _is_etl_project(self, project_path: Path) -> bool:
+        """Verifica se o projeto é um projeto ETL"""
+        # Basta o primeiro arquivo encontrado
+        return any(entry.name.endswith(self.ETL_EXTENSIONS) for entry in self._scandir_recursive(project_path))
 
     def _detect_etl_type(self, project_path: Path) -> str:
         """Detecta o tipo específico de projeto ETL"""
-        # Verificar arquivos Pentaho
-        if any(project_path.rglob('*.ktr')) or any(project_path.rglob('*.kjb')):
-            return 'etl_pentaho'
+        # Uma única varredura coleta as extensões presentes (e os primeiros
+        # arquivos Python); a prioridade entre os tipos é aplicada depois
+        found = set()
+        python_files = []
+        for entry in self._scandir_recursive(project_path):
+            extension = entry.name.rpartition('.')[2].lower()
+            kind = self.ETL_EXTENSION_KINDS.get(extension)
+            if kind is None:
+                continue
+            
+            # Pentaho tem a maior prioridade: não há o que procurar depois
+            if kind == 'etl_pentaho':
+                return 'etl_pentaho'
+            
+            found.add(kind)
+            if kind == 'python' and len(python_files) < 5:
+                python_files.append(entry.path)
         
         # Verificar arquivos SQL
-        if any(project_path.rglob('*.sql')):
+        if 'etl_sql' in found:
             return 'etl_sql'
         
-        # Verificar arquivos Python ETL
-        python_files = list(project_path.rglob('*.py'))
-        if python_files:
-            for py_file in python_files[:5]:  # Verificar apenas os primeiros 5 arquivos
-                try:
-                    with open(py_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if any(pattern in content for pattern in ['pyspark', 'SparkSession']):
-                            return 'etl_python_spark'
-                        elif any(pattern in content for pattern in ['airflow', 'DAG']):
-                            return 'etl_python_airflow'
-                        elif any(pattern in content for pattern in ['pandas', 'pd.', 'df.']):
-                            return 'etl_python_pandas'
-                except Exception:
-                    continue
+        # Verificar arquivos Python ETL (apenas os primeiros 5 arquivos)
+        for py_file in python_files:
+            etl_type = self._sniff_python_etl(py_file)
+            if etl_type:
+                return etl_type
         
         # Verificar arquivos R
-        if any(project_path.rglob('*.r')) or any(project_path.rglob('*.R')):
+        if 'etl_r' in found:
             return 'etl_r'
         
         # Verificar arquivos Scala/Java
-        if any(project_path.rglob('*.scala')) or any(project_path.rglob('*.java')):
+        if 'etl_scala_java' in found:
             return 'etl_scala_java'
         
         return 'etl_generic'
 
-    def analyze_project(self, project_path: Path, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Analisa um projeto usando o analisador apropriado"""
-        project_type = self.detect_project_type(project_path)
+    def _sniff_python_etl(self, py_file: str) -> Optional[str]:
+        """Identifica Spark, Airflow ou Pandas pelo início de um arquivo Python
+        
+        Lê só os primeiros 64KB, em bytes (sem decodificar). A prioridade é
+        Spark > Airflow > Pandas independentemente da posição no arquivo: após
+        cada ocorrência, a busca continua apenas pelos tipos de maior prioridade.
+        """
+        try:
+            with open(py_file, 'rb') as f:
+                head = f.read(_PYTHON_SNIFF_BYTES)
+        except OSError:
+            return None
+        
+        best = None
+        match = _ETL_PYTHON_RE.search(head)
+        while match:
+            best = match.lastindex
+            if best == 1:
+                break
+            match = _ETL_PYTHON_HIGHER_RE[best].search(head, match.end())
+        
+        return _ETL_PYTHON_TYPES[best] if best else None
+
+    def analyze_project(self, project_path: Path, filters: Optional[Dict[str, Any]] = None,
+                        project_type: Optional[str] = None) -> Dict[str, Any]:
+        """Analisa um projeto usando o analisador apropriado
+        
+        Se o tipo já tiver sido detectado pelo chamador, pode ser informado em
+        project_type para evitar uma nova detecção.
+        """
+        if project_type is None:
+            project_type = self.detect_project_type(project_path)
         analyzer = self.create_analyzer(project_type)
         
 
@@ -4,16 +4,189 @@ Versão: 2.0
 Data: 2025-08-29
 """
 
+import os
 import re
 import logging
+import functools
+import contextlib
+from collections import deque
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Type
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Type
 
 from rich.console import Console
 
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from dto import CNPJFieldInterface, ImpactLevel, Status, CNPJFieldBase
 from infrastructure.type_extractors.extractor_factory import TypeExtractorFactory
+from infrastructure.scan_cache import ScanCache
+
+# Threads para a leitura dos arquivos em scan_files
+_READ_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Arquivos maiores que isto não são lidos, por padrão (ver get_max_file_size;
+# o filtro 'max_file_size' substitui o limite)
+_MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# Bytes iniciais inspecionados para reconhecer arquivos binários
+_BINARY_SNIFF_BYTES = 4096
+
+# Categorias buscadas linha a linha pelos find_* e o método que fornece os
+# padrões de cada uma
+_LINE_PATTERN_HOOKS = (
+    ('field_names', 'get_field_patterns'),
+    ('validation_patterns', 'get_validation_patterns'),
+    ('mask_patterns', 'get_mask_patterns')
+)
+
+# Se todo padrão de uma categoria contém um destes literais, arquivos sem
+# nenhum deles são descartados com uma busca, sem separar e percorrer as linhas.
+# Como os padrões dos find_*, são buscados no conteúdo em minúsculas
+_LINE_PATTERN_LITERALS = {
+    'field_names': ('cnpj', 'documento'),
+    'validation_patterns': ('cnpj', 'documento'),
+    'mask_patterns': ('cnpj',)
+}
+
+# Minúsculas só para ASCII, caractere a caractere (preserva as posições)
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# Padrões para extrair o nome do campo, em ordem de prioridade
+_FIELD_NAME_PATTERNS = (
+    r'(\w+cnpj\w*)',
+    r'(\w+documento\w*)',
+    r'(\w+_cnpj\w*)',
+    r'(\w+_cpf_cnpj\w*)',
+    r'(\w+cpfcnpj\w*)',
+    r'(CpfCnpj\w*)',
+    r'(CpfCnpjValidator)'
+)
+
+
+# Esforço estimado por nível de impacto
+_EFFORT_BY_IMPACT = {
+    ImpactLevel.LOW: "1-2 horas",
+    ImpactLevel.MEDIUM: "4-8 horas",
+    ImpactLevel.HIGH: "1-2 dias",
+    ImpactLevel.CRITICAL: "2-5 dias"
+}
+
+# CNPJ alfanumérico requer mínimo 14 caracteres (formato atual) e idealmente 18 para futuro
+_MIN_CNPJ_SIZE = 14
+_IDEAL_CNPJ_SIZE = 18
+
+# Resultado de _assess_impact por (tipo, faixa do tamanho): 'small' (< mínimo),
+# 'medium' (< ideal), 'ok' e 'unknown' (sem tamanho). Nas faixas 'small' e
+# 'medium', {size} é substituído pelo tamanho do campo
+_DEFAULT_IMPACT = (ImpactLevel.MEDIUM, Status.NEEDS_ANALYSIS, "Análise manual necessária")
+_CRITICAL_SIZE_IMPACT = (
+    ImpactLevel.CRITICAL, Status.INCOMPATIBLE,
+    f"CRÍTICO: Tamanho {{size}} < {_MIN_CNPJ_SIZE}. Alterar para VARCHAR(18)"
+)
+_COMPATIBLE_IMPACT = (ImpactLevel.LOW, Status.COMPATIBLE, "Nenhuma alteração necessária")
+_INTEGER_IMPACT = (ImpactLevel.HIGH, Status.INCOMPATIBLE, "Alterar tipo para VARCHAR(18)")
+_IMPACT_TABLE = {
+    ('VARCHAR', 'small'): _CRITICAL_SIZE_IMPACT,
+    ('VARCHAR', 'medium'): (
+        ImpactLevel.MEDIUM, Status.ATTENTION,
+        f"Aumentar tamanho de {{size}} para {_IDEAL_CNPJ_SIZE}"
+    ),
+    ('VARCHAR', 'ok'): _COMPATIBLE_IMPACT,
+    ('VARCHAR', 'unknown'): _DEFAULT_IMPACT,
+    ('CHAR', 'small'): _CRITICAL_SIZE_IMPACT,
+    ('CHAR', 'medium'): (
+        ImpactLevel.MEDIUM, Status.ATTENTION,
+        f"Alterar para VARCHAR(18) ou aumentar CHAR para {_IDEAL_CNPJ_SIZE}"
+    ),
+    ('CHAR', 'ok'): _COMPATIBLE_IMPACT,
+    ('CHAR', 'unknown'): _COMPATIBLE_IMPACT,
+}
+for _bucket in ('small', 'medium', 'ok', 'unknown'):
+    _IMPACT_TABLE[('INTEGER', _bucket)] = _INTEGER_IMPACT
+    _IMPACT_TABLE[('TEXT', _bucket)] = _COMPATIBLE_IMPACT
+
+# Tipos de campo reconhecidos por _extract_field_type_and_size sem file_path,
+# em ordem de prioridade: (regex, tipo, se o grupo 1 traz o tamanho)
+_FALLBACK_TYPE_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), field_type, has_size)
+    for pattern, field_type, has_size in (
+        # SQL padrão
+        (r'VARCHAR\s*\(\s*(\d+)\s*\)', 'VARCHAR', True),
+        (r'CHAR\s*\(\s*(\d+)\s*\)', 'CHAR', True),
+        (r'TEXT', 'TEXT', False),
+        (r'INT|BIGINT', 'INTEGER', False),
+        # Migrations do Phinx (PHP)
+        (r"'string'.*'length'.*=>\s*(\d+)", 'VARCHAR', True),
+        (r"'char'.*'length'.*=>\s*(\d+)", 'CHAR', True),
+        (r"'text'", 'TEXT', False),
+        (r"'integer'", 'INTEGER', False),
+        # Migrations do Laravel
+        (r'\$table->string\s*\(\s*[\'"][^\'"]+[\'"]\s*,\s*(\d+)\s*\)', 'VARCHAR', True),
+        (r'\$table->integer\s*\(\s*[\'"][^\'"]+[\'"]\s*\)', 'INTEGER', False),
+        (r'\$table->text\s*\(\s*[\'"][^\'"]+[\'"]\s*\)', 'TEXT', False)
+    )
+)
+
+
+def _first_match_re(patterns, flags: int = 0) -> re.Pattern:
+    """Compila padrões (com um grupo cada) testados em ordem, como um laço de re.search
+    
+    Cada alternativa é um lookahead ancorado no início da linha: vence o primeiro
+    padrão da lista que ocorrer em qualquer posição (e não o que ocorrer antes na
+    linha). Usar com .match(); o grupo capturado é match.group(match.lastindex).
+    """
+    return re.compile('|'.join(f'(?=.*?{pattern})' for pattern in patterns), flags)
+
+
+_FIELD_NAME_RE = _first_match_re(_FIELD_NAME_PATTERNS, re.IGNORECASE)
+
+
+def _compile_union(pattern: str):
+    """Compila a união de padrões (já em minúsculas) de uma categoria
+    
+    Com o RE2 instalado a busca roda em tempo linear no tamanho do arquivo,
+    sem retrocesso; padrões com recursos que o RE2 não suporta ficam no re.
+    """
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+def _lower_pattern(pattern: str) -> str:
+    """Passa para minúsculas as letras de um padrão, sem alterar os escapes (\\S, \\W...)"""
+    return re.sub(r'\\.|[A-Z]+', lambda m: m.group() if m.group()[0] == '\\' else m.group().lower(), pattern)
+
+
+@functools.lru_cache(maxsize=64)
+def _substring_matcher(patterns: Tuple[str, ...]):
+    """Retorna uma função que diz se um caminho contém algum dos padrões
+    
+    Com o pyahocorasick instalado, um autômato com todos os padrões percorre o
+    caminho uma única vez; sem ele, cada padrão é testado com `in` (mais
+    rápido que uma alternação no re para listas de literais).
+    """
+    if AHOCORASICK_AVAILABLE and patterns and '' not in patterns:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    return lambda text: any(pattern in text for pattern in patterns)
 
 class BaseAnalyzer(ABC):
     """Classe base para todos os analisadores"""
@@ -25,53 +198,130 @@ class BaseAnalyzer(ABC):
         self.logger = logging.getLogger(f"{__name__}.{project_type}")
         self.type_extractor_factory = TypeExtractorFactory()
         
-        # Padrões de busca para CNPJ
-        self.cnpj_patterns = {
-            'field_names': [
-                r'cnpj',
-                r'cpf_cnpj',
-                r'cpfcnpj',
-                r'nr_documento',
-                r'documento',
-                r'numero_documento',
-                r'cnpj_cpf',
-                r'documento_fiscal',
-                r'cpfcnpjpagador',
-                r'cpf_cnpj_base',
-                r'cnpj_base',
-                r'cpfcnpj_indicador',
-                r'cpfcnpj_indicado',
-                r'cpf_cnpj_indicador',
-                r'cpf_cnpj_indicado',
-                r'CpfCnpj',
-                r'CpfCnpjValidator'
-            ],
-            'validation_patterns': [
-                r'cnpj.*validat',
-                r'validat.*cnpj',
-                r'cpf.*cnpj.*validat',
-                r'documento.*validat',
-                r'CpfCnpjValidator',
-                r'cpfcnpj.*validat',
-                r'validat.*cpfcnpj',
-                r'Rule::cnpj',
-                r'cnpj.*rule',
-                r'rule.*cnpj'
-            ],
-            'mask_patterns': [
-                r'cnpj.*mask',
-                r'mask.*cnpj',
-                r'format.*cnpj',
-                r'cnpj.*format'
-            ],
-            'database_patterns': [
-                r'VARCHAR\s*\(\s*(\d+)\s*\)',
-                r'CHAR\s*\(\s*(\d+)\s*\)',
-                r'TEXT',
-                r'BIGINT',
-                r'INT'
-            ]
-        }
+        self._compile_line_patterns()
+
+    def get_field_patterns(self) -> List[str]:
+        """Retorna os padrões de nomes de campo CNPJ buscados por find_cnpj_fields"""
+        return [
+            r'cnpj',
+            r'cpf_cnpj',
+            r'cpfcnpj',
+            r'nr_documento',
+            r'documento',
+            r'numero_documento',
+            r'cnpj_cpf',
+            r'documento_fiscal',
+            r'cpfcnpjpagador',
+            r'cpf_cnpj_base',
+            r'cnpj_base',
+            r'cpfcnpj_indicador',
+            r'cpfcnpj_indicado',
+            r'cpf_cnpj_indicador',
+            r'cpf_cnpj_indicado',
+            r'CpfCnpj',
+            r'CpfCnpjValidator'
+        ]
+
+    def get_validation_patterns(self) -> List[str]:
+        """Retorna os padrões de validação de CNPJ buscados por find_validations"""
+        return [
+            r'cnpj.*validat',
+            r'validat.*cnpj',
+            r'cpf.*cnpj.*validat',
+            r'documento.*validat',
+            r'CpfCnpjValidator',
+            r'cpfcnpj.*validat',
+            r'validat.*cpfcnpj',
+            r'Rule::cnpj',
+            r'cnpj.*rule',
+            r'rule.*cnpj'
+        ]
+
+    def get_mask_patterns(self) -> List[str]:
+        """Retorna os padrões de máscara de CNPJ buscados por find_frontend_masks"""
+        return [
+            r'cnpj.*mask',
+            r'mask.*cnpj',
+            r'format.*cnpj',
+            r'cnpj.*format'
+        ]
+
+    def _compile_line_patterns(self):
+        """Compila os padrões buscados linha a linha
+        
+        Para cada categoria guarda a união dos padrões do seu get_*_patterns:
+        cada linha em que ela ocorre gera um único resultado, mesmo que vários
+        padrões da categoria apareçam na linha. Os padrões são passados para
+        minúsculas e buscados no texto em minúsculas (ver _lower_content).
+        Quando algum padrão não contém os literais da categoria, o descarte
+        prévio dos arquivos usa a própria união. Uma categoria sem padrões fica
+        sem união (None) e seu find_* não percorre os arquivos.
+        """
+        self._literal_res = {}
+        self._union_res = {}
+        for category, hook in _LINE_PATTERN_HOOKS:
+            patterns = [_lower_pattern(pattern) for pattern in getattr(self, hook)()]
+            if not patterns:
+                self._literal_res[category] = self._union_res[category] = None
+                continue
+            union_re = _compile_union('|'.join(f'(?:{pattern})' for pattern in patterns))
+            literals = _LINE_PATTERN_LITERALS[category]
+            if all(any(literal in pattern for literal in literals) for pattern in patterns):
+                self._literal_res[category] = re.compile('|'.join(literals))
+            else:
+                self._literal_res[category] = union_re
+            self._union_res[category] = union_re
+
+    @staticmethod
+    def _lower_content(content: str) -> str:
+        """Conteúdo de um arquivo em minúsculas, com as mesmas posições do original
+        
+        Os find_* buscam padrões em minúsculas nesse texto em vez de usar
+        re.IGNORECASE a cada linha. Se lower() mudar o tamanho do texto (caso de
+        alguns caracteres não ASCII), só as letras ASCII são convertidas.
+        """
+        lowered = content.lower()
+        if len(lowered) != len(content):
+            lowered = content.translate(_ASCII_LOWER)
+        return lowered
+
+    def _lowered(self, file_info: Dict) -> str:
+        """_lower_content do arquivo de file_info, calculado uma vez por arquivo
+        
+        O texto fica em file_info['content_lower'], para os demais find_*
+        chamados sobre o mesmo arquivo, e é descartado junto com o file_info.
+        """
+        content_lower = file_info.get('content_lower')
+        if content_lower is None:
+            content_lower = file_info['content_lower'] = self._lower_content(file_info['content'])
+        return content_lower
+
+    def _iter_matching_lines(self, content: str, content_lower: str,
+                             regex) -> Iterator[Tuple[int, str]]:
+        """Gera (número, texto) de cada linha de content em que regex ocorre
+        
+        regex é buscado em content_lower (content em minúsculas, ver
+        _lower_content). Uma única busca percorre o arquivo inteiro, sem
+        separá-lo em linhas; o número da linha sai da contagem de quebras desde
+        a linha anterior. Os padrões buscados não atravessam quebras de linha.
+        """
+        line_num = 1
+        line_start = 0
+        next_line = 0
+        for match in regex.finditer(content_lower):
+            pos = match.start()
+            # Outra ocorrência em uma linha já gerada
+            if pos < next_line:
+                continue
+            
+            start = content_lower.rfind('\n', 0, pos) + 1
+            line_num += content_lower.count('\n', line_start, start)
+            line_start = start
+            end = content_lower.find('\n', pos)
+            if end == -1:
+                end = len(content_lower)
+            next_line = end + 1
+            yield line_num, content[start:end]
 
     @abstractmethod
     def get_file_extensions(self) -> List[str]:
@@ -83,9 +333,50 @@ class BaseAnalyzer(ABC):
         """Retorna padrões de arquivos/pastas para ignorar"""
         pass
 
-    def scan_files(self, project_path: Path, filters: Optional[Dict] = None) -> List[Dict]:
+    def get_max_file_size(self) -> Optional[int]:
+        """Tamanho máximo, em bytes, dos arquivos lidos (None: sem limite)
+        
+        Usado quando os filtros não trazem 'max_file_size'.
+        """
+        return _MAX_FILE_BYTES
+
+    def _open_scan_cache(self, project_path: Path, filters: Optional[Dict],
+                         namespace: Optional[str] = None):
+        """Abre, para uso com with, o cache por arquivo de filters['cache_dir']
+        
+        Com o cache, o resultado de cada arquivo fica em disco e arquivos
+        inalterados não são reanalisados nas execuções seguintes (ver
+        iter_scanned_files). Sem 'cache_dir' o with recebe None. O namespace
+        padrão separa analisador e tipo de projeto.
+        """
+        if not (filters and filters.get('cache_dir')):
+            return contextlib.nullcontext()
+        if namespace is None:
+            namespace = f"{type(self).__name__}_{self.project_type}"
+        return ScanCache(filters['cache_dir'], namespace, project_path)
+
+    def scan_files(self, project_path: Path, filters: Optional[Dict] = None,
+                   skipped: Optional[List[str]] = None) -> List[Dict]:
         """Escaneia arquivos do projeto com filtros opcionais"""
-        files = []
+        return list(self.iter_scanned_files(project_path, filters, skipped=skipped))
+
+    def iter_scanned_files(self, project_path: Path, filters: Optional[Dict] = None,
+                           cache: Optional[ScanCache] = None,
+                           skipped: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Gera os arquivos de scan_files à medida que são lidos
+        
+        As leituras rodam em paralelo (a E/S libera o GIL), mas só uma janela de
+        _READ_WORKERS * 2 arquivos fica em memória à frente do consumidor. A
+        ordem é a mesma de scan_files.
+        
+        Com cache, arquivos inalterados não são lidos: geram um dicionário com
+        'cached' (o resultado guardado) no lugar de 'content'; os demais trazem
+        'cache_key' para que o resultado seja guardado depois.
+        
+        Arquivos acima do tamanho máximo não são gerados; seus caminhos são
+        acrescentados a skipped, se informado, para constarem no resultado.
+        """
+        candidates = []
         extensions = self.get_file_extensions()
         skip_patterns = self.get_skip_patterns()
         
@@ -96,72 +387,206 @@ class BaseAnalyzer(ABC):
         else:
             include_patterns = []
         
-        for ext in extensions:
-            for file_path in project_path.rglob(f'*{ext}'):
-                if file_path.is_file() and not self._should_skip_file(file_path, skip_patterns):
-                    # Verificar se deve incluir baseado nos padrões de inclusão
-                    if include_patterns and not self._should_include_file(file_path, include_patterns):
-                        continue
-                        
-                    try:
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        files.append({
-                            'file_path': str(file_path),
-                            'content': content,
-                            'extension': ext
-                        })
-                    except Exception as e:
-                        self.logger.warning(f"Erro ao ler arquivo {file_path}: {e}")
-        
-        return files
+        # Limites de leitura: tamanho máximo em bytes (0/None desativa) e se
+        # arquivos binários são ignorados
+        filters = filters or {}
+        max_size = filters.get('max_file_size', self.get_max_file_size())
+        read_file = functools.partial(
+            self._read_file,
+            max_size=max_size,
+            skip_binary=filters.get('skip_binary', True)
+        )
+        if cache is not None:
+            read_file = functools.partial(self._read_cached_file, cache, read_file, max_size)
+        
+        should_include = _substring_matcher(tuple(include_patterns))
+        for file_path, ext in self._iter_files(project_path, extensions, skip_patterns):
+            # Verificar se deve incluir baseado nos padrões de inclusão
+            if include_patterns and not should_include(str(file_path)):
+                continue
+            candidates.append((file_path, ext))
+        
+        with ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+            pending = deque()
+            for candidate in candidates:
+                pending.append(executor.submit(read_file, candidate))
+                if len(pending) < _READ_WORKERS * 2:
+                    continue
+                file_info = pending.popleft().result()
+                if self._accept_read(file_info, skipped):
+                    yield file_info
+            
+            while pending:
+                file_info = pending.popleft().result()
+                if self._accept_read(file_info, skipped):
+                    yield file_info
+
+    def _iter_files(self, project_path: Path, extensions: List[str],
+                    skip_patterns: List[str]) -> Iterator[Tuple[Path, str]]:
+        """Gera (arquivo, extensão) dos arquivos do projeto com as extensões dadas
+        
+        Uma única varredura com os.scandir substitui um rglob por extensão. A
+        ordem é a mesma dos rglob em sequência: por extensão e, dentro dela, em
+        pré-ordem de diretórios. Diretórios cujo caminho contém um padrão de
+        skip_patterns não são percorridos: todo arquivo abaixo deles seria
+        ignorado por _should_skip_file.
+        """
+        suffixes = tuple(extensions)
+        by_extension = [[] for _ in extensions]
+        should_skip = _substring_matcher(tuple(skip_patterns))
+        
+        stack = [project_path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            subdirectories = []
+            for entry in entries:
+                name = entry.name
+                if name.endswith(suffixes):
+                    file_path = directory / name
+                    if self._is_file(entry) and not should_skip(str(file_path)):
+                        for index, ext in enumerate(extensions):
+                            if name.endswith(ext):
+                                by_extension[index].append((file_path, ext))
+                
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    subdirectory = directory / name
+                    if not should_skip(str(subdirectory)):
+                        subdirectories.append(subdirectory)
+            
+            # Em ordem inversa na pilha: o primeiro subdiretório sai primeiro
+            stack.extend(reversed(subdirectories))
+        
+        for files in by_extension:
+            yield from files
+
+    @staticmethod
+    def _is_file(entry: os.DirEntry) -> bool:
+        """Se a entrada é um arquivo (seguindo links simbólicos, como Path.is_file)"""
+        try:
+            return entry.is_file()
+        except OSError:
+            return False
+
+    @staticmethod
+    def _accept_read(file_info: Optional[Dict], skipped: Optional[List[str]]) -> bool:
+        """Se um resultado de _read_file deve ser gerado por iter_scanned_files"""
+        if file_info is None:
+            return False
+        if 'skipped' in file_info:
+            if skipped is not None:
+                skipped.append(file_info['file_path'])
+            return False
+        return True
+
+    def _read_file(self, candidate: Tuple[Path, str], max_size: Optional[int] = _MAX_FILE_BYTES,
+                   skip_binary: bool = True) -> Optional[Dict]:
+        """Lê um arquivo encontrado por scan_files (None se ignorado ou com erro)
+        
+        Arquivos com mais de max_size bytes não são lidos: retornam apenas
+        'file_path' e 'skipped', pois deixam de fazer parte da análise e isso
+        precisa ser informado. Com skip_binary, arquivos com byte nulo no início
+        são descartados como binários.
+        """
+        file_path, ext = candidate
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if max_size and size > max_size:
+                    self.logger.warning(
+                        f"Arquivo não analisado ({size} bytes, limite de {max_size}; "
+                        f"ajuste com --max-file-size): {file_path}"
+                    )
+                    return {'file_path': str(file_path), 'skipped': size}
+                
+                head = f.read(_BINARY_SNIFF_BYTES)
+                if skip_binary and b'\0' in head:
+                    self.logger.debug(f"Arquivo binário ignorado: {file_path}")
+                    return None
+                data = head + f.read()
+        except Exception as e:
+            self.logger.warning(f"Erro ao ler arquivo {file_path}: {e}")
+            return None
+        
+        # Mesmo resultado de read_text: UTF-8 ignorando erros, com quebras de
+        # linha universais
+        content = data.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        return {
+            'file_path': str(file_path),
+            'content': content,
+            'extension': ext
+        }
+
+    def _read_cached_file(self, cache: ScanCache, read_file, max_size: Optional[int],
+                          candidate: Tuple[Path, str]) -> Optional[Dict]:
+        """Como _read_file, mas sem ler arquivos cujo resultado está no cache"""
+        file_path, ext = candidate
+        key = cache.key(file_path)
+        # O tamanho (último item do carimbo) também limita os acertos: um
+        # resultado guardado sem limite não vale para um arquivo agora ignorado
+        if key is not None and max_size and key[1][-1] > max_size:
+            return read_file(candidate)
+        cached = cache.get(key)
+        if cached is not None:
+            return {
+                'file_path': str(file_path),
+                'extension': ext,
+                'cached': cached
+            }
+        
+        file_info = read_file(candidate)
+        if file_info is not None:
+            file_info['cache_key'] = key
+        return file_info
 
     def _should_skip_file(self, file_path: Path, skip_patterns: List[str]) -> bool:
         """Verifica se o arquivo deve ser ignorado"""
-        return any(pattern in str(file_path) for pattern in skip_patterns)
+        return _substring_matcher(tuple(skip_patterns))(str(file_path))
 
     def _should_include_file(self, file_path: Path, include_patterns: List[str]) -> bool:
         """Verifica se o arquivo deve ser incluído baseado nos padrões"""
-        return any(pattern in str(file_path) for pattern in include_patterns)
+        return _substring_matcher(tuple(include_patterns))(str(file_path))
 
     def find_cnpj_fields(self, files: List[Dict]) -> List[CNPJFieldInterface]:
         """Encontra campos relacionados a CNPJ nos arquivos"""
         cnpj_fields = []
+        union_re = self._union_res['field_names']
+        if union_re is None:
+            return cnpj_fields
+        literal_search = self._literal_res['field_names'].search
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['field_names']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        field = self._analyze_cnpj_field(
-                            file_path, line_num, line
-                        )
-                        if field:
-                            cnpj_fields.append(field)
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                field = self._analyze_cnpj_field(
+                    file_path, line_num, line
+                )
+                if field:
+                    cnpj_fields.append(field)
         
         return cnpj_fields
 
     def _analyze_cnpj_field(self, file_path: str, line_num: int, line: str) -> Optional[CNPJFieldInterface]:
         """Analisa um campo CNPJ específico"""
         # Extrair nome do campo - padrões mais abrangentes
-        field_patterns = [
-            r'(\w+cnpj\w*)',
-            r'(\w+documento\w*)',
-            r'(\w+_cnpj\w*)',
-            r'(\w+_cpf_cnpj\w*)',
-            r'(\w+cpfcnpj\w*)',
-            r'(CpfCnpj\w*)',
-            r'(CpfCnpjValidator)'
-        ]
-        
-        field_name = None
-        for pattern in field_patterns:
-            field_match = re.search(pattern, line, re.IGNORECASE)
-            if field_match:
-                field_name = field_match.group(1)
-                break
+        field_match = _FIELD_NAME_RE.match(line)
+        field_name = field_match.group(field_match.lastindex) if field_match else None
                 
         if not field_name:
             return None
@@ -206,158 +631,161 @@ class BaseAnalyzer(ABC):
             extractor = self.type_extractor_factory.get_extractor(file_path)
             return extractor.extract_type_and_size(line)
         else:
-            # Fallback para o método antigo se não tiver file_path
-            # Padrões para diferentes tipos de campo SQL padrão
-            varchar_match = re.search(r'VARCHAR\s*\(\s*(\d+)\s*\)', line, re.IGNORECASE)
-            char_match = re.search(r'CHAR\s*\(\s*(\d+)\s*\)', line, re.IGNORECASE)
-            text_match = re.search(r'TEXT', line, re.IGNORECASE)
-            int_match = re.search(r'INT|BIGINT', line, re.IGNORECASE)
-            
-            # Padrões para migrations do Phinx (PHP)
-            phinx_string_match = re.search(r"'string'.*'length'.*=>\s*(\d+)", line, re.IGNORECASE)
-            phinx_char_match = re.search(r"'char'.*'length'.*=>\s*(\d+)", line, re.IGNORECASE)
-            phinx_text_match = re.search(r"'text'", line, re.IGNORECASE)
-            phinx_integer_match = re.search(r"'integer'", line, re.IGNORECASE)
+            # Fallback para o método antigo se não tiver file_path: padrões
+            # SQL, depois Phinx e Laravel (vence o primeiro padrão da lista)
+            for regex, field_type, has_size in _FALLBACK_TYPE_PATTERNS:
+                match = regex.search(line)
+                if match:
+                    return field_type, int(match.group(1)) if has_size else None
             
-            # Padrões para Laravel migrations
-            laravel_string_match = re.search(r'\$table->string\s*\(\s*[\'"][^\'"]+[\'"]\s*,\s*(\d+)\s*\)', line, re.IGNORECASE)
-            laravel_integer_match = re.search(r'\$table->integer\s*\(\s*[\'"][^\'"]+[\'"]\s*\)', line, re.IGNORECASE)
-            laravel_text_match = re.search(r'\$table->text\s*\(\s*[\'"][^\'"]+[\'"]\s*\)', line, re.IGNORECASE)
-            
-            # Verificar padrões SQL primeiro
-            if varchar_match:
-                return 'VARCHAR', int(varchar_match.group(1))
-            elif char_match:
-                return 'CHAR', int(char_match.group(1))
-            elif text_match:
-                return 'TEXT', None
-            elif int_match:
-                return 'INTEGER', None
-            
-            # Verificar padrões Phinx
-            elif phinx_string_match:
-                return 'VARCHAR', int(phinx_string_match.group(1))
-            elif phinx_char_match:
-                return 'CHAR', int(phinx_char_match.group(1))
-            elif phinx_text_match:
-                return 'TEXT', None
-            elif phinx_integer_match:
-                return 'INTEGER', None
-            
-            # Verificar padrões Laravel
-            elif laravel_string_match:
-                return 'VARCHAR', int(laravel_string_match.group(1))
-            elif laravel_integer_match:
-                return 'INTEGER', None
-            elif laravel_text_match:
-                return 'TEXT', None
-            
-            else:
-                return 'UNKNOWN', None
-
-    def _assess_impact(self, field_type: str, field_size: Optional[int]) -> tuple:
-        """Avalia o impacto da mudança do CNPJ alfanumérico"""
-        # CNPJ alfanumérico requer mínimo 14 caracteres (formato atual) e idealmente 18 para futuro
-        min_cnpj_size = 14
-        ideal_cnpj_size = 18
-        
-        if field_type == 'INTEGER':
-            return ImpactLevel.HIGH, Status.INCOMPATIBLE, "Alterar tipo para VARCHAR(18)"
-        elif field_type == 'VARCHAR':
-            if field_size and field_size < min_cnpj_size:
-                return ImpactLevel.CRITICAL, Status.INCOMPATIBLE, f"CRÍTICO: Tamanho {field_size} < {min_cnpj_size}. Alterar para VARCHAR(18)"
-            elif field_size and field_size < ideal_cnpj_size:
-                return ImpactLevel.MEDIUM, Status.ATTENTION, f"Aumentar tamanho de {field_size} para {ideal_cnpj_size}"
-            elif field_size and field_size >= ideal_cnpj_size:
-                return ImpactLevel.LOW, Status.COMPATIBLE, "Nenhuma alteração necessária"
-            else:
-                return ImpactLevel.MEDIUM, Status.NEEDS_ANALYSIS, "Análise manual necessária"
-        elif field_type == 'CHAR':
-            if field_size and field_size < min_cnpj_size:
-                return ImpactLevel.CRITICAL, Status.INCOMPATIBLE, f"CRÍTICO: Tamanho {field_size} < {min_cnpj_size}. Alterar para VARCHAR(18)"
-            elif field_size and field_size < ideal_cnpj_size:
-                return ImpactLevel.MEDIUM, Status.ATTENTION, f"Alterar para VARCHAR(18) ou aumentar CHAR para {ideal_cnpj_size}"
-            else:
-                return ImpactLevel.LOW, Status.COMPATIBLE, "Nenhuma alteração necessária"
-        elif field_type == 'TEXT':
-            return ImpactLevel.LOW, Status.COMPATIBLE, "Nenhuma alteração necessária"
+            return 'UNKNOWN', None
+
+    @staticmethod
+    def _assess_impact(field_type: str, field_size: Optional[int]) -> tuple:
+        """Avalia o impacto da mudança do CNPJ alfanumérico
+        
+        Consulta _IMPACT_TABLE pela faixa do tamanho; o tamanho só é formatado
+        na mensagem das faixas abaixo do ideal.
+        """
+        if not field_size:
+            bucket = 'unknown'
+        elif field_size < _MIN_CNPJ_SIZE:
+            bucket = 'small'
+        elif field_size < _IDEAL_CNPJ_SIZE:
+            bucket = 'medium'
         else:
-            return ImpactLevel.MEDIUM, Status.NEEDS_ANALYSIS, "Análise manual necessária"
+            bucket = 'ok'
+        
+        impact_level, status, action_needed = _IMPACT_TABLE.get((field_type, bucket), _DEFAULT_IMPACT)
+        if bucket == 'small' or bucket == 'medium':
+            action_needed = action_needed.format(size=field_size)
+        return impact_level, status, action_needed
 
-    def _estimate_effort(self, impact_level: ImpactLevel) -> str:
+    @staticmethod
+    def _estimate_effort(impact_level: ImpactLevel) -> str:
         """Estima o esforço necessário baseado no nível de impacto"""
-        effort_map = {
-            ImpactLevel.LOW: "1-2 horas",
-            ImpactLevel.MEDIUM: "4-8 horas",
-            ImpactLevel.HIGH: "1-2 dias",
-            ImpactLevel.CRITICAL: "2-5 dias"
-        }
-        return effort_map.get(impact_level, "A definir")
+        return _EFFORT_BY_IMPACT.get(impact_level, "A definir")
 
     def find_validations(self, files: List[Dict]) -> List[Dict]:
         """Encontra validações relacionadas a CNPJ"""
         validations = []
+        union_re = self._union_res['validation_patterns']
+        if union_re is None:
+            return validations
+        literal_search = self._literal_res['validation_patterns'].search
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['validation_patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        validations.append({
-                            'file_path': file_path,
-                            'line_number': line_num,
-                            'line': line.strip(),
-                            'validation_type': 'CNPJ'
-                        })
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                validations.append({
+                    'file_path': file_path,
+                    'line_number': line_num,
+                    'line': line.strip(),
+                    'validation_type': 'CNPJ'
+                })
         
         return validations
 
     def find_frontend_masks(self, files: List[Dict]) -> List[Dict]:
         """Encontra máscaras de CNPJ no frontend"""
         masks = []
+        union_re = self._union_res['mask_patterns']
+        if union_re is None:
+            return masks
+        literal_search = self._literal_res['mask_patterns'].search
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['mask_patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        masks.append({
-                            'file_path': file_path,
-                            'line_number': line_num,
-                            'line': line.strip(),
-                            'mask_type': 'CNPJ'
-                        })
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                masks.append({
+                    'file_path': file_path,
+                    'line_number': line_num,
+                    'line': line.strip(),
+                    'mask_type': 'CNPJ'
+                })
         
         return masks
 
+    def _scan_project(self, project_path: Path, filters: Optional[Dict],
+                      analyze_file: Callable[[Dict], Tuple], results: Tuple,
+                      namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Analisa os arquivos do projeto um a um, juntando os resultados em results
+        
+        Cada arquivo passa por analyze_file assim que é lido e seu conteúdo é
+        descartado em seguida: a memória não cresce com o tamanho do projeto.
+        analyze_file retorna uma tupla paralela a results; cada lista de
+        results é estendida e cada dicionário, chave a chave. Com
+        filters['cache_dir'] essa tupla fica em disco e arquivos inalterados
+        não são reanalisados nas execuções seguintes (ver _open_scan_cache).
+        
+        Retorna as contagens para o resultado da análise: 'files_scanned',
+        'files_cached' (arquivos cujo resultado veio do cache) e
+        'files_skipped' (arquivos acima do tamanho máximo, não analisados).
+        """
+        files_scanned = 0
+        files_cached = 0
+        files_skipped = []
+        with self._open_scan_cache(project_path, filters, namespace) as cache:
+            for file_info in self.iter_scanned_files(project_path, filters, cache, files_skipped):
+                if 'cached' in file_info:
+                    file_results = file_info['cached']
+                    files_cached += 1
+                else:
+                    file_results = analyze_file(file_info)
+                    if cache is not None:
+                        cache.set(file_info['cache_key'], file_results)
+                for found, file_found in zip(results, file_results):
+                    if isinstance(found, dict):
+                        for key, items in file_found.items():
+                            found[key].extend(items)
+                    else:
+                        found.extend(file_found)
+                files_scanned += 1
+        
+        return {
+            'files_scanned': files_scanned,
+            'files_cached': files_cached,
+            'files_skipped': files_skipped
+        }
+
+    def _analyze_file(self, file_info: Dict) -> Tuple[List[Any], ...]:
+        """Campos, validações, máscaras e o caminho de um arquivo (ver analyze_project)"""
+        batch = [file_info]
+        return (
+            self.find_cnpj_fields(batch),
+            self.find_validations(batch),
+            self.find_frontend_masks(batch),
+            [file_info['file_path']]
+        )
+
     def analyze_project(self, project_path: Path, filters: Optional[Dict] = None) -> Dict[str, Any]:
         """Analisa um projeto e retorna os resultados"""
         project_name = project_path.name if hasattr(project_path, 'name') else str(project_path).split('/')[-1]
         self.console.print(f"[blue]Analisando projeto {self.project_type}: {project_name}[/blue]")
         
-        # Escanear arquivos com filtros
-        files = self.scan_files(project_path, filters)
-        
-        # Encontrar campos CNPJ
-        cnpj_fields = self.find_cnpj_fields(files)
-        
-        # Encontrar validações
-        validations = self.find_validations(files)
-        
-        # Encontrar máscaras
-        masks = self.find_frontend_masks(files)
+        cnpj_fields = []
+        validations = []
+        masks = []
+        scanned_paths = []
+        scan = self._scan_project(project_path, filters, self._analyze_file,
+                                  (cnpj_fields, validations, masks, scanned_paths))
         
         return {
             'project_type': self.project_type,
-            'total_files_scanned': len(files),
+            'total_files_scanned': scan['files_scanned'],
+            'files_cached': scan['files_cached'],
+            'files_skipped': scan['files_skipped'],
             'cnpj_fields_found': cnpj_fields,
             'validations': validations,
             'frontend_masks': masks,
-            'files': files
+            # Apenas os caminhos; o conteúdo pode ser relido se necessário
+            'files': scanned_paths
         }
@@ -4,14 +4,236 @@ Versão: 2.0
 Data: 2025-08-28
 """
 
+import os
 import re
+import bisect
+import functools
+import itertools
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 
 from .base_analyzer import BaseAnalyzer
 from dto import CNPJFieldETL, CNPJFieldInterface, ImpactLevel, Status
 
+# Padrões dos find_* do ETLAnalyzer, compilados uma única vez
+_ETL_FLAGS = re.MULTILINE | re.IGNORECASE
+
+# Os trechos livres entre termos dos padrões são limitados a 500 caracteres
+# ('.{0,500}' em vez de '.*'): em linhas muito longas (SQL minificado ou
+# gerado) '.*' volta até o início a cada posição candidata e a busca fica
+# quadrática; com o limite ela é linear no tamanho do arquivo
+
+# Campos com CNPJ em transformations do Pentaho, em uma única alternação (ver
+# _finditer_by_alternative)
+_PENTAHO_FIELD_RE = re.compile('|'.join((
+    r'<name>([^<]*cnpj[^<]*)</name>',
+    r'<field_name>([^<]*cnpj[^<]*)</field_name>',
+    r'<column_name>([^<]*cnpj[^<]*)</column_name>'
+)), _ETL_FLAGS)
+
+# Nomes e tipos de transformations/jobs do Pentaho com CNPJ (as tags
+# diferenciam maiúsculas, o 'cnpj' não)
+_PENTAHO_VALUE_RE = re.compile('|'.join((
+    r'<name>([^<]*(?i:cnpj)[^<]*)</name>',
+    r'<type>([^<]*(?i:cnpj)[^<]*)</type>'
+)), re.MULTILINE)
+
+# Cláusulas SELECT e as colunas dentro delas
+_SQL_SELECT_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'SELECT\s+([^FROM]+)\s+FROM',
+    r'SELECT\s+DISTINCT\s+([^FROM]+)\s+FROM'
+))
+_SQL_COLUMN_RE = re.compile(r'(\w+)\s*as\s*(\w+)|(\w+)', re.IGNORECASE)
+
+# Tabelas referenciadas em SQL
+_SQL_TABLE_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'FROM\s+([^\s;]+)',
+    r'JOIN\s+([^\s;]+)',
+    r'UPDATE\s+([^\s;]+)',
+    r'INSERT\s+INTO\s+([^\s(]+)'
+))
+
+# Queries SQL com CNPJ
+_SQL_QUERY_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'SELECT.{0,500}cnpj.{0,500}FROM',
+    r'INSERT.{0,500}cnpj.{0,500}INTO',
+    r'UPDATE.{0,500}cnpj.{0,500}SET',
+    r'WHERE.{0,500}cnpj',
+    r'AND.{0,500}cnpj',
+    r'OR.{0,500}cnpj'
+))
+
+# Colunas do pandas com CNPJ
+_PANDAS_COLUMN_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'df\[[\'"]([^\'"]*cnpj[^\'"]*)[\'"]\]',
+    r'df\.loc\[.{0,500}[\'"]([^\'"]*cnpj[^\'"]*)[\'"]\]',
+    r'df\.filter\(.{0,500}[\'"]([^\'"]*cnpj[^\'"]*)[\'"]\)'
+))
+
+# Variáveis, funções e classes Python com CNPJ
+_PYTHON_VARIABLE_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'(\w+)\s*=\s*.{0,500}cnpj',
+    r'def\s+(\w+).{0,500}cnpj',
+    r'class\s+(\w+).{0,500}cnpj'
+))
+
+# Transformations de DataFrame com CNPJ
+_PYTHON_TRANSFORMATION_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'df.{0,500}cnpj.{0,500}=',
+    r'df.{0,500}=.{0,500}cnpj',
+    r'df\.rename.{0,500}cnpj',
+    r'df\.drop.{0,500}cnpj',
+    r'df\.fillna.{0,500}cnpj',
+    r'df\.replace.{0,500}cnpj'
+))
+
+# Referências a CNPJ em etapas de ETL
+_ETL_CNPJ_REFERENCE_RES = tuple(re.compile(pattern, _ETL_FLAGS) for pattern in (
+    r'cnpj.{0,500}extract',
+    r'extract.{0,500}cnpj',
+    r'cnpj.{0,500}transform',
+    r'transform.{0,500}cnpj',
+    r'cnpj.{0,500}load',
+    r'load.{0,500}cnpj',
+    r'ETL.{0,500}cnpj',
+    r'cnpj.{0,500}ETL',
+    r'data.{0,500}cnpj',
+    r'cnpj.{0,500}data',
+    r'process.{0,500}cnpj',
+    r'cnpj.{0,500}process'
+))
+
+# Trecho que cada padrão de _ETL_CNPJ_REFERENCE_RES exige além de 'cnpj', em
+# minúsculas. 'transform' e 'process' são reduzidos a trechos sem 's', que com
+# IGNORECASE também casa 'ſ' (ausente de lower())
+_ETL_CNPJ_REFERENCE_KEYWORDS = (
+    'extract', 'extract',
+    'tran', 'tran',
+    'load', 'load',
+    'etl', 'etl',
+    'data', 'data',
+    'proce', 'proce'
+)
+
+
+# Diretórios de dependências, build e ferramentas: não são percorridos
+_SKIP_DIRS = frozenset({
+    'node_modules', '.git', '__pycache__', '.venv', 'venv', 'dist', 'build',
+    'target', 'bin', 'obj', '.idea', '.vscode'
+})
+
+
+def _walk(project_path: Path) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """os.walk do projeto sem descer nos diretórios de _SKIP_DIRS
+    
+    Os diretórios são podados em dirs[:], então suas subárvores nunca são
+    listadas. A ordem é a do rglob: pré-ordem de diretórios.
+    """
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [name for name in dirs if name not in _SKIP_DIRS]
+        yield root, dirs, files
+
+
+def _find_files(project_path: Path, suffix: str) -> List[Path]:
+    """Arquivos do projeto terminados em suffix, na ordem de _walk"""
+    return [Path(root, name)
+            for root, _, files in _walk(project_path)
+            for name in files if name.endswith(suffix)]
+
+
+def _finditer_by_alternative(regex: re.Pattern, content: str) -> Iterator[re.Match]:
+    """Ocorrências de uma alternação, na ordem de um finditer por alternativa
+    
+    O texto é percorrido uma única vez e as ocorrências são agrupadas pela
+    alternativa que casou (cada uma tem exatamente um grupo, identificado por
+    match.lastindex). Só vale para alternativas cujas ocorrências não se
+    sobrepõem, como tags XML distintas.
+    """
+    by_alternative = [[] for _ in range(regex.groups)]
+    for match in regex.finditer(content):
+        by_alternative[match.lastindex - 1].append(match)
+    return itertools.chain.from_iterable(by_alternative)
+
+
+def _finditer_in_spans(regexes, content: str, spans: Tuple[Tuple[int, int], ...]) -> Iterator[re.Match]:
+    """Ocorrências de cada regex, em ordem, procuradas só nos trechos de spans
+    
+    Equivale a um finditer de cada regex no texto inteiro quando toda
+    ocorrência cabe em um dos trechos (padrões de uma linha com 'cnpj', com
+    spans de _ETLText.cnpj_line_spans).
+    """
+    for regex in regexes:
+        for start, end in spans:
+            yield from regex.finditer(content, start, end)
+
+
+class _ETLText:
+    """Conteúdo de um arquivo e os dados derivados que os find_* consultam
+    
+    Criado uma vez por arquivo em ETLAnalyzer._analyze_file e passado a cada
+    find_*: cada dado é calculado na primeira consulta, reaproveitado pelos
+    demais find_* do mesmo arquivo e descartado junto com o objeto.
+    """
+
+    def __init__(self, content: str, content_lower: Optional[str] = None):
+        self.content = content
+        if content_lower is not None:
+            self.lower = content_lower
+
+    @functools.cached_property
+    def lower(self) -> str:
+        """Conteúdo em minúsculas, com as mesmas posições (ver BaseAnalyzer._lower_content)"""
+        return BaseAnalyzer._lower_content(self.content)
+
+    @functools.cached_property
+    def line_starts(self) -> List[int]:
+        """Deslocamentos do início de cada linha, a partir da segunda
+        
+        Comprimentos das linhas, somados às quebras, acumulados.
+        """
+        return list(itertools.accumulate(len(line) + 1 for line in self.content.split('\n')))
+
+    def line_of(self, pos: int) -> int:
+        """Número da linha (a partir de 1) da posição pos, por busca binária"""
+        return bisect.bisect_right(self.line_starts, pos) + 1
+
+    @functools.cached_property
+    def pentaho_cnpj_values(self) -> Tuple[Tuple[int, str], ...]:
+        """(linha, valor) de cada <name>/<type> com CNPJ
+        
+        find_pentaho_transformations e find_pentaho_jobs consultam os mesmos
+        valores: o arquivo é percorrido uma única vez para os dois.
+        """
+        return tuple((self.line_of(match.start()), match.group(match.lastindex))
+                     for match in _finditer_by_alternative(_PENTAHO_VALUE_RE, self.content))
+
+    @functools.cached_property
+    def cnpj_line_spans(self) -> Tuple[Tuple[int, int], ...]:
+        """(início, fim) de cada linha que contém 'cnpj'
+        
+        Todo padrão de _SQL_QUERY_RES, _PYTHON_TRANSFORMATION_RES e
+        _ETL_CNPJ_REFERENCE_RES contém 'cnpj' e não atravessa quebras de linha,
+        então só precisa ser procurado nesses trechos. 'cnpj' é localizado com
+        str.find no texto em minúsculas e a busca recomeça na linha seguinte: as
+        demais ocorrências da mesma linha nem são visitadas. Consultado por
+        find_sql_queries/find_python_transformations e find_cnpj_in_etl.
+        """
+        content_lower = self.lower
+        find = content_lower.find
+        spans = []
+        pos = find('cnpj')
+        while pos != -1:
+            start = content_lower.rfind('\n', 0, pos) + 1
+            end = find('\n', pos)
+            if end == -1:
+                spans.append((start, len(content_lower)))
+                break
+            spans.append((start, end))
+            pos = find('cnpj', end + 1)
+        return tuple(spans)
+
+
 class ETLAnalyzer(BaseAnalyzer):
     """Analisador específico para projetos ETL"""
     
@@ -144,6 +366,18 @@ class ETLAnalyzer(BaseAnalyzer):
         """Retorna as extensões de arquivo suportadas"""
         return ['.ktr', '.kjb', '.xml', '.sql', '.py', '.r', '.scala', '.java', '.sh', '.bash', '.yaml', '.yml', '.json']
 
+    def get_validation_patterns(self) -> List[str]:
+        """Sem padrões: projetos ETL não têm validações buscadas linha a linha"""
+        return []
+
+    def get_mask_patterns(self) -> List[str]:
+        """Sem padrões: projetos ETL não têm máscaras frontend"""
+        return []
+
+    def get_max_file_size(self) -> Optional[int]:
+        """Sem limite de tamanho: dumps SQL e transformações grandes são o caso comum"""
+        return None
+
     def get_skip_patterns(self) -> List[str]:
         """Retorna padrões de arquivos para pular"""
         return [
@@ -169,36 +403,45 @@ class ETLAnalyzer(BaseAnalyzer):
 
     def _detect_etl_type(self, project_path: Path) -> str:
         """Detecta o tipo específico do projeto ETL"""
-        # Verificar arquivos Pentaho
-        if any(project_path.rglob('*.ktr')) or any(project_path.rglob('*.kjb')):
-            return 'pentaho'
+        # Uma única varredura da árvore coleta as extensões presentes (como
+        # nos globs '*.ext', que também casam diretórios) e os primeiros .py,
+        # em vez de um rglob por extensão; diretórios de _SKIP_DIRS não contam
+        extensions = set()
+        python_files = []
+        for root, dirs, files in _walk(project_path):
+            for name in itertools.chain(dirs, files):
+                if '.' in name:
+                    extensions.add('.' + name.rsplit('.', 1)[1])
+            if len(python_files) < 5:
+                python_files.extend(os.path.join(root, name) for name in files if name.endswith('.py'))
+            # Pentaho tem prioridade sobre as demais extensões
+            if '.ktr' in extensions or '.kjb' in extensions:
+                return 'pentaho'
         
         # Verificar arquivos SQL
-        if any(project_path.rglob('*.sql')):
+        if '.sql' in extensions:
             return 'sql'
         
         # Verificar arquivos Python ETL
-        python_files = list(project_path.rglob('*.py'))
-        if python_files:
-            for py_file in python_files[:5]:  # Verificar apenas os primeiros 5 arquivos
-                try:
-                    with open(py_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if any(pattern in content for pattern in ['pandas', 'pd.', 'df.']):
-                            return 'python_pandas'
-                        if any(pattern in content for pattern in ['pyspark', 'SparkSession']):
-                            return 'python_spark'
-                        if any(pattern in content for pattern in ['airflow', 'DAG']):
-                            return 'python_airflow'
-                except Exception:
-                    continue
+        for py_file in python_files[:5]:  # Verificar apenas os primeiros 5 arquivos
+            try:
+                with open(py_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                    if any(pattern in content for pattern in ['pandas', 'pd.', 'df.']):
+                        return 'python_pandas'
+                    if any(pattern in content for pattern in ['pyspark', 'SparkSession']):
+                        return 'python_spark'
+                    if any(pattern in content for pattern in ['airflow', 'DAG']):
+                        return 'python_airflow'
+            except Exception:
+                continue
         
         # Verificar arquivos R
-        if any(project_path.rglob('*.r')) or any(project_path.rglob('*.R')):
+        if '.r' in extensions or '.R' in extensions:
             return 'r'
         
         # Verificar arquivos Scala/Java
-        if any(project_path.rglob('*.scala')) or any(project_path.rglob('*.java')):
+        if '.scala' in extensions or '.java' in extensions:
             return 'scala_java'
         
         return 'etl_generic'
@@ -208,7 +451,7 @@ class ETLAnalyzer(BaseAnalyzer):
         pentaho_files = []
         
         # Buscar arquivos .ktr (transformations)
-        for file_path in project_path.rglob('*.ktr'):
+        for file_path in _find_files(project_path, '.ktr'):
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -221,7 +464,7 @@ class ETLAnalyzer(BaseAnalyzer):
                 self.logger.error(f"Erro ao ler arquivo Pentaho {file_path}: {e}")
         
         # Buscar arquivos .kjb (jobs)
-        for file_path in project_path.rglob('*.kjb'):
+        for file_path in _find_files(project_path, '.kjb'):
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -239,7 +482,7 @@ class ETLAnalyzer(BaseAnalyzer):
         """Escaneia arquivos SQL"""
         sql_files = []
         
-        for file_path in project_path.rglob('*.sql'):
+        for file_path in _find_files(project_path, '.sql'):
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -257,7 +500,7 @@ class ETLAnalyzer(BaseAnalyzer):
         """Escaneia arquivos Python ETL"""
         python_files = []
         
-        for file_path in project_path.rglob('*.py'):
+        for file_path in _find_files(project_path, '.py'):
             if self._is_etl_python_file(file_path):
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
@@ -291,62 +534,66 @@ class ETLAnalyzer(BaseAnalyzer):
         except Exception:
             return False
 
-    def find_pentaho_specific_patterns(self, content: str, file_path: str) -> List[CNPJFieldInterface]:
+    def _mentions_cnpj(self, text: _ETLText) -> bool:
+        """Se o conteúdo contém 'cnpj' (sem diferenciar maiúsculas)
+        
+        Todo resultado dos find_* do ETL contém 'cnpj', então um arquivo sem o
+        trecho dispensa todas as buscas.
+        """
+        return 'cnpj' in text.lower
+
+    def find_pentaho_specific_patterns(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[CNPJFieldInterface]:
         """Encontra padrões específicos do Pentaho"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         fields = []
         
         # Buscar campos com CNPJ em transformations
-        field_patterns = [
-            r'<name>([^<]*cnpj[^<]*)</name>',
-            r'<field_name>([^<]*cnpj[^<]*)</field_name>',
-            r'<column_name>([^<]*cnpj[^<]*)</column_name>'
-        ]
-        
-        for pattern in field_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
-                field_name = match.group(1)
-                fields.append(self.create_cnpj_field(
-                    file_path=file_path,
-                    line_number=content[:match.start()].count('\n') + 1,
-                    field_name=field_name,
-                    field_type='PENTAHO_FIELD',
-                    field_size=None,
-                    context=f"Campo Pentaho: {field_name}",
-                    project_type='etl_pentaho',
-                    impact_level=ImpactLevel.MEDIUM,
-                    status=Status.NEEDS_ANALYSIS,
-                    action_needed='Revisar validação de CNPJ',
-                    estimated_effort='2-4 horas',
-                    etl_tool='Pentaho',
-                    etl_type='Transformation',
-                    data_type='STRING'
-                ))
+        for match in _finditer_by_alternative(_PENTAHO_FIELD_RE, content):
+            field_name = match.group(match.lastindex)
+            fields.append(self.create_cnpj_field(
+                file_path=file_path,
+                line_number=text.line_of(match.start()),
+                field_name=field_name,
+                field_type='PENTAHO_FIELD',
+                field_size=None,
+                context=f"Campo Pentaho: {field_name}",
+                project_type='etl_pentaho',
+                impact_level=ImpactLevel.MEDIUM,
+                status=Status.NEEDS_ANALYSIS,
+                action_needed='Revisar validação de CNPJ',
+                estimated_effort='2-4 horas',
+                etl_tool='Pentaho',
+                etl_type='Transformation',
+                data_type='STRING'
+            ))
         
         return fields
 
-    def find_sql_specific_patterns(self, content: str, file_path: str) -> List[CNPJFieldInterface]:
+    def find_sql_specific_patterns(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[CNPJFieldInterface]:
         """Encontra padrões específicos do SQL"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         fields = []
         
         # Buscar colunas com CNPJ em SELECT
-        select_patterns = [
-            r'SELECT\s+([^FROM]+)\s+FROM',
-            r'SELECT\s+DISTINCT\s+([^FROM]+)\s+FROM'
-        ]
-        
-        for pattern in select_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
+        for regex in _SQL_SELECT_RES:
+            for match in regex.finditer(content):
                 select_clause = match.group(1)
                 # Buscar colunas com CNPJ
-                column_matches = re.finditer(r'(\w+)\s*as\s*(\w+)|(\w+)', select_clause, re.IGNORECASE)
+                column_matches = _SQL_COLUMN_RE.finditer(select_clause)
                 for col_match in column_matches:
                     column_name = col_match.group(2) or col_match.group(3) or col_match.group(1)
                     if 'cnpj' in column_name.lower():
                         fields.append(self.create_cnpj_field(
                             file_path=file_path,
-                            line_number=content[:match.start()].count('\n') + 1,
+                            line_number=text.line_of(match.start()),
                             field_name=column_name,
                             field_type='SQL_COLUMN',
                             field_size=None,
@@ -359,21 +606,13 @@ class ETLAnalyzer(BaseAnalyzer):
                         ))
         
         # Buscar tabelas com CNPJ
-        table_patterns = [
-            r'FROM\s+([^\s;]+)',
-            r'JOIN\s+([^\s;]+)',
-            r'UPDATE\s+([^\s;]+)',
-            r'INSERT\s+INTO\s+([^\s(]+)'
-        ]
-        
-        for pattern in table_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
+        for regex in _SQL_TABLE_RES:
+            for match in regex.finditer(content):
                 table_name = match.group(1)
                 if 'cnpj' in table_name.lower():
                     fields.append(self.create_cnpj_field(
                         file_path=file_path,
-                        line_number=content[:match.start()].count('\n') + 1,
+                        line_number=text.line_of(match.start()),
                         field_name=table_name,
                         field_type='SQL_TABLE',
                         field_size=None,
@@ -390,24 +629,22 @@ class ETLAnalyzer(BaseAnalyzer):
         
         return fields
 
-    def find_python_etl_patterns(self, content: str, file_path: str) -> List[CNPJFieldInterface]:
+    def find_python_etl_patterns(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[CNPJFieldInterface]:
         """Encontra padrões específicos do Python ETL"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         fields = []
         
         # Buscar colunas do pandas com CNPJ
-        pandas_patterns = [
-            r'df\[[\'"]([^\'"]*cnpj[^\'"]*)[\'"]\]',
-            r'df\.loc\[.*[\'"]([^\'"]*cnpj[^\'"]*)[\'"]\]',
-            r'df\.filter\(.*[\'"]([^\'"]*cnpj[^\'"]*)[\'"]\)'
-        ]
-        
-        for pattern in pandas_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
+        for regex in _PANDAS_COLUMN_RES:
+            for match in regex.finditer(content):
                 column_name = match.group(1)
                 fields.append(self.create_cnpj_field(
                     file_path=file_path,
-                    line_number=content[:match.start()].count('\n') + 1,
+                    line_number=text.line_of(match.start()),
                     field_name=column_name,
                     field_type='PYTHON_PANDAS_COLUMN',
                     field_size=None,
@@ -423,20 +660,13 @@ class ETLAnalyzer(BaseAnalyzer):
                 ))
         
         # Buscar variáveis com CNPJ
-        variable_patterns = [
-            r'(\w+)\s*=\s*.*cnpj',
-            r'def\s+(\w+).*cnpj',
-            r'class\s+(\w+).*cnpj'
-        ]
-        
-        for pattern in variable_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
+        for regex in _PYTHON_VARIABLE_RES:
+            for match in regex.finditer(content):
                 variable_name = match.group(1)
                 if 'cnpj' in variable_name.lower():
                     fields.append(self.create_cnpj_field(
                         file_path=file_path,
-                        line_number=content[:match.start()].count('\n') + 1,
+                        line_number=text.line_of(match.start()),
                         field_name=variable_name,
                         field_type='PYTHON_VARIABLE',
                         field_size=None,
@@ -453,141 +683,165 @@ class ETLAnalyzer(BaseAnalyzer):
         
         return fields
 
-    def find_pentaho_transformations(self, content: str, file_path: str) -> List[Dict[str, Any]]:
+    def find_pentaho_transformations(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[Dict[str, Any]]:
         """Encontra transformations do Pentaho"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         transformations = []
         
         # Buscar transformations
-        transformation_patterns = [
-            r'<name>([^<]+)</name>',
-            r'<type>([^<]+)</type>'
-        ]
-        
-        for pattern in transformation_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE)
-            for match in matches:
-                value = match.group(1)
-                if 'cnpj' in value.lower():
-                    transformations.append({
-                        'file_path': file_path,
-                        'line_number': content[:match.start()].count('\n') + 1,
-                        'value': value,
-                        'type': 'PENTAHO_TRANSFORMATION'
-                    })
+        for line_number, value in text.pentaho_cnpj_values:
+            transformations.append({
+                'file_path': file_path,
+                'line_number': line_number,
+                'value': value,
+                'type': 'PENTAHO_TRANSFORMATION'
+            })
         
         return transformations
 
-    def find_pentaho_jobs(self, content: str, file_path: str) -> List[Dict[str, Any]]:
+    def find_pentaho_jobs(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[Dict[str, Any]]:
         """Encontra jobs do Pentaho"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         jobs = []
         
         # Buscar jobs
-        job_patterns = [
-            r'<name>([^<]+)</name>',
-            r'<type>([^<]+)</type>'
-        ]
-        
-        for pattern in job_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE)
-            for match in matches:
-                value = match.group(1)
-                if 'cnpj' in value.lower():
-                    jobs.append({
-                        'file_path': file_path,
-                        'line_number': content[:match.start()].count('\n') + 1,
-                        'value': value,
-                        'type': 'PENTAHO_JOB'
-                    })
+        for line_number, value in text.pentaho_cnpj_values:
+            jobs.append({
+                'file_path': file_path,
+                'line_number': line_number,
+                'value': value,
+                'type': 'PENTAHO_JOB'
+            })
         
         return jobs
 
-    def find_sql_queries(self, content: str, file_path: str) -> List[Dict[str, Any]]:
+    def find_sql_queries(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[Dict[str, Any]]:
         """Encontra queries SQL"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         queries = []
         
         # Buscar queries com CNPJ
-        query_patterns = [
-            r'SELECT.*cnpj.*FROM',
-            r'INSERT.*cnpj.*INTO',
-            r'UPDATE.*cnpj.*SET',
-            r'WHERE.*cnpj',
-            r'AND.*cnpj',
-            r'OR.*cnpj'
-        ]
-        
-        for pattern in query_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
-                query_text = match.group(0)
-                queries.append({
-                    'file_path': file_path,
-                    'line_number': content[:match.start()].count('\n') + 1,
-                    'query_text': query_text,
-                    'type': 'SQL_QUERY'
-                })
+        for match in _finditer_in_spans(_SQL_QUERY_RES, content, text.cnpj_line_spans):
+            query_text = match.group(0)
+            queries.append({
+                'file_path': file_path,
+                'line_number': text.line_of(match.start()),
+                'query_text': query_text,
+                'type': 'SQL_QUERY'
+            })
         
         return queries
 
-    def find_python_transformations(self, content: str, file_path: str) -> List[Dict[str, Any]]:
+    def find_python_transformations(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[Dict[str, Any]]:
         """Encontra transformations Python"""
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
+        
         transformations = []
         
         # Buscar transformations com CNPJ
-        transformation_patterns = [
-            r'df.*cnpj.*=',
-            r'df.*=.*cnpj',
-            r'df\.rename.*cnpj',
-            r'df\.drop.*cnpj',
-            r'df\.fillna.*cnpj',
-            r'df\.replace.*cnpj'
-        ]
-        
-        for pattern in transformation_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
-                transformation_text = match.group(0)
-                transformations.append({
-                    'file_path': file_path,
-                    'line_number': content[:match.start()].count('\n') + 1,
-                    'transformation_text': transformation_text,
-                    'type': 'PYTHON_TRANSFORMATION'
-                })
+        for match in _finditer_in_spans(_PYTHON_TRANSFORMATION_RES, content, text.cnpj_line_spans):
+            transformation_text = match.group(0)
+            transformations.append({
+                'file_path': file_path,
+                'line_number': text.line_of(match.start()),
+                'transformation_text': transformation_text,
+                'type': 'PYTHON_TRANSFORMATION'
+            })
         
         return transformations
 
-    def find_cnpj_in_etl(self, content: str, file_path: str) -> List[Dict[str, Any]]:
+    def find_cnpj_in_etl(self, content: str, file_path: str, text: Optional[_ETLText] = None) -> List[Dict[str, Any]]:
         """Encontra referências específicas a CNPJ em ETL"""
-        cnpj_references = []
+        if text is None:
+            text = _ETLText(content)
+        if not self._mentions_cnpj(text):
+            return []
         
-        # Padrões específicos de CNPJ em ETL
-        cnpj_patterns = [
-            r'cnpj.*extract',
-            r'extract.*cnpj',
-            r'cnpj.*transform',
-            r'transform.*cnpj',
-            r'cnpj.*load',
-            r'load.*cnpj',
-            r'ETL.*cnpj',
-            r'cnpj.*ETL',
-            r'data.*cnpj',
-            r'cnpj.*data',
-            r'process.*cnpj',
-            r'cnpj.*process'
-        ]
+        cnpj_references = []
         
-        for pattern in cnpj_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-            for match in matches:
-                reference_text = match.group(0)
-                cnpj_references.append({
-                    'file_path': file_path,
-                    'line_number': content[:match.start()].count('\n') + 1,
-                    'reference_text': reference_text,
-                    'type': 'ETL_CNPJ_REFERENCE'
-                })
+        # Padrões específicos de CNPJ em ETL, só nas linhas com 'cnpj' que
+        # também contêm o trecho exigido pelo padrão
+        content_lower = text.lower
+        spans = text.cnpj_line_spans
+        for keyword, regex in zip(_ETL_CNPJ_REFERENCE_KEYWORDS, _ETL_CNPJ_REFERENCE_RES):
+            for start, end in spans:
+                if content_lower.find(keyword, start, end) == -1:
+                    continue
+                
+                for match in regex.finditer(content, start, end):
+                    reference_text = match.group(0)
+                    cnpj_references.append({
+                        'file_path': file_path,
+                        'line_number': text.line_of(match.start()),
+                        'reference_text': reference_text,
+                        'type': 'ETL_CNPJ_REFERENCE'
+                    })
         
         return cnpj_references
 
+    def _etl_finders(self, etl_type: str) -> Tuple[Tuple[int, Callable[..., List[Any]]], ...]:
+        """find_* que rodam em cada arquivo para o tipo de ETL
+        
+        Cada find_* vem com o índice da lista de resultados de _analyze_file
+        que recebe o que ele encontra. Resolvido uma vez por projeto, antes do
+        laço sobre os arquivos.
+        """
+        if etl_type == 'pentaho':
+            finders = (
+                (1, self.find_pentaho_specific_patterns),
+                (2, self.find_pentaho_transformations),
+                (3, self.find_pentaho_jobs)
+            )
+        elif etl_type == 'sql':
+            finders = (
+                (1, self.find_sql_specific_patterns),
+                (4, self.find_sql_queries)
+            )
+        elif etl_type.startswith('python'):
+            finders = (
+                (1, self.find_python_etl_patterns),
+                (5, self.find_python_transformations)
+            )
+        else:
+            finders = ()
+        
+        return finders + ((6, self.find_cnpj_in_etl),)
+
+    def _analyze_file(self, file_info: Dict[str, Any],
+                      finders: Tuple[Tuple[int, Callable[..., List[Any]]], ...]) -> Tuple[List[Any], ...]:
+        """Resultados de um arquivo, na ordem das listas de analyze_project
+        
+        (campos CNPJ, campos específicos do ETL, transformations, jobs,
+        queries, transformations Python, referências a CNPJ)
+        """
+        file_path = file_info['file_path']
+        content = file_info['content']
+        results = tuple([] for _ in range(7))
+        results[0].extend(self.find_cnpj_fields([file_info]))
+        
+        if content:
+            # Dados derivados do conteúdo compartilhados pelos find_* do arquivo
+            text = _ETLText(content, self._lowered(file_info))
+            for index, find in finders:
+                results[index].extend(find(content, file_path, text))
+        
+        return results
+
     def analyze_project(self, project_path: Path, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analisa um projeto ETL"""
         self.logger.info(f"Analisando projeto ETL: {project_path}")
@@ -595,36 +849,21 @@ class ETLAnalyzer(BaseAnalyzer):
         # Detectar tipo específico do projeto ETL
         etl_type = self._detect_etl_type(project_path)
         
-        # Escanear arquivos
-        scanned_files = self.scan_files(project_path, filters)
-        
-        # Encontrar campos CNPJ
-        cnpj_fields = self.find_cnpj_fields(scanned_files)
-        
-        # Buscar padrões específicos do ETL
+        # Encontrar campos CNPJ e padrões específicos do ETL, arquivo a arquivo
+        cnpj_fields = []
         etl_specific_fields = []
         transformations = []
         jobs = []
         queries = []
         python_transformations = []
         cnpj_references = []
-        
-        for file_info in scanned_files:
-            file_path = file_info['file_path']
-            content = file_info['content']
-            if content:
-                if etl_type == 'pentaho':
-                    etl_specific_fields.extend(self.find_pentaho_specific_patterns(content, file_path))
-                    transformations.extend(self.find_pentaho_transformations(content, file_path))
-                    jobs.extend(self.find_pentaho_jobs(content, file_path))
-                elif etl_type == 'sql':
-                    etl_specific_fields.extend(self.find_sql_specific_patterns(content, file_path))
-                    queries.extend(self.find_sql_queries(content, file_path))
-                elif etl_type.startswith('python'):
-                    etl_specific_fields.extend(self.find_python_etl_patterns(content, file_path))
-                    python_transformations.extend(self.find_python_transformations(content, file_path))
-                
-                cnpj_references.extend(self.find_cnpj_in_etl(content, file_path))
+        results = (cnpj_fields, etl_specific_fields, transformations, jobs,
+                   queries, python_transformations, cnpj_references)
+        finders = self._etl_finders(etl_type)
+        # O tipo de ETL entra no namespace do cache: ele decide quais find_* rodam
+        scan = self._scan_project(project_path, filters,
+                                  functools.partial(self._analyze_file, finders=finders),
+                                  results, f"{type(self).__name__}_{etl_type}")
         
         # Combinar campos
         all_fields = cnpj_fields + etl_specific_fields
@@ -648,7 +887,7 @@ class ETLAnalyzer(BaseAnalyzer):
             'validations_found': [],
             'frontend_masks': [],
             'overall_impact': overall_impact.value if overall_impact else 'baixo',
-            'files_scanned': len(scanned_files),
+            **scan,
             'framework_detected': 'etl',
             'etl_type': etl_type,
             'etl_components': {
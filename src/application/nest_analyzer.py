@@ -7,7 +7,7 @@ Data: 2025-08-28
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from .base_analyzer import BaseAnalyzer
 from dto import CNPJFieldNest, CNPJFieldInterface, ImpactLevel, Status
@@ -99,6 +99,14 @@ class NestAnalyzer(BaseAnalyzer):
         """Retorna as extensões de arquivo suportadas"""
         return ['.ts', '.js', '.json']
 
+    def get_validation_patterns(self) -> List[str]:
+        """Sem padrões: as validações vêm de find_cnpj_validations"""
+        return []
+
+    def get_mask_patterns(self) -> List[str]:
+        """Sem padrões: NestJS não tem máscaras frontend"""
+        return []
+
     def get_skip_patterns(self) -> List[str]:
         """Retorna padrões de arquivos para pular"""
         return [
@@ -186,20 +194,21 @@ class NestAnalyzer(BaseAnalyzer):
     def find_cnpj_fields(self, files: List[Dict]) -> List[CNPJFieldInterface]:
         """Encontra campos relacionados a CNPJ nos arquivos NestJS"""
         cnpj_fields = []
+        literal_search = self._literal_res['field_names'].search
+        union_re = self._union_res['field_names']
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['field_names']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        field = self._analyze_nest_cnpj_field(
-                            file_path, line_num, line, content
-                        )
-                        if field:
-                            cnpj_fields.append(field)
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                field = self._analyze_nest_cnpj_field(
+                    file_path, line_num, line, content
+                )
+                if field:
+                    cnpj_fields.append(field)
         
         return cnpj_fields
 
@@ -569,6 +578,27 @@ class NestAnalyzer(BaseAnalyzer):
         
         return validations
 
+    def _analyze_file(self, file_info: Dict[str, Any]) -> Tuple[List[Any], ...]:
+        """Resultados de um arquivo, na ordem das listas de analyze_project
+        
+        (campos CNPJ, campos específicos do NestJS, controllers, services, DTOs,
+        entities, validações)
+        """
+        file_path = file_info['file_path']
+        content = file_info['content']
+        results = tuple([] for _ in range(7))
+        results[0].extend(self.find_cnpj_fields([file_info]))
+        
+        if content:
+            results[1].extend(self.find_nest_specific_patterns(content, file_path))
+            results[2].extend(self.find_controllers(content, file_path))
+            results[3].extend(self.find_services(content, file_path))
+            results[4].extend(self.find_dtos(content, file_path))
+            results[5].extend(self.find_entities(content, file_path))
+            results[6].extend(self.find_cnpj_validations(content, file_path))
+        
+        return results
+
     def analyze_project(self, project_path: Path, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analisa um projeto NestJS"""
         self.logger.info(f"Analisando projeto NestJS: {project_path}")
@@ -577,30 +607,17 @@ class NestAnalyzer(BaseAnalyzer):
         package_info = self.scan_package_json(project_path)
         project_type = package_info.get('projectType', 'nest_generic')
         
-        # Escanear arquivos
-        scanned_files = self.scan_files(project_path, filters)
-        
-        # Encontrar campos CNPJ
-        cnpj_fields = self.find_cnpj_fields(scanned_files)
-        
-        # Buscar padrões específicos do NestJS
+        # Encontrar campos CNPJ e padrões específicos do NestJS, arquivo a arquivo
+        cnpj_fields = []
         nest_specific_fields = []
         controllers = []
         services = []
         dtos = []
         entities = []
         validations = []
-        
-        for file_info in scanned_files:
-            file_path = file_info['file_path']
-            content = file_info['content']
-            if content:
-                nest_specific_fields.extend(self.find_nest_specific_patterns(content, file_path))
-                controllers.extend(self.find_controllers(content, file_path))
-                services.extend(self.find_services(content, file_path))
-                dtos.extend(self.find_dtos(content, file_path))
-                entities.extend(self.find_entities(content, file_path))
-                validations.extend(self.find_cnpj_validations(content, file_path))
+        results = (cnpj_fields, nest_specific_fields, controllers, services,
+                   dtos, entities, validations)
+        scan = self._scan_project(project_path, filters, self._analyze_file, results)
         
         # Combinar campos
         all_fields = cnpj_fields + nest_specific_fields
@@ -625,7 +642,7 @@ class NestAnalyzer(BaseAnalyzer):
             'frontend_masks': [],  # NestJS não tem máscaras frontend
             'overall_impact': overall_impact.value if overall_impact else 'baixo',
             'package_info': package_info,
-            'files_scanned': len(scanned_files),
+            **scan,
             'framework_detected': 'nestjs',
             'nestjs_components': {
                 'controllers': controllers,
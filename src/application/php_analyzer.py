@@ -7,7 +7,7 @@ Data: 2025-08-28
 import re
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from .base_analyzer import BaseAnalyzer
 from dto import CNPJFieldPHP, ImpactLevel, Status
@@ -37,6 +37,14 @@ class PHPAnalyzer(BaseAnalyzer):
         """Retorna as extensões de arquivo suportadas"""
         return ['.php', '.sql', '.yml', '.yaml']
     
+    def get_validation_patterns(self) -> List[str]:
+        """Sem padrões: as validações vêm do PHPValidationAnalyzer"""
+        return []
+    
+    def get_mask_patterns(self) -> List[str]:
+        """Sem padrões: projetos PHP não têm máscaras frontend"""
+        return []
+    
     def get_skip_patterns(self) -> List[str]:
         """Retorna padrões de arquivos/pastas para ignorar"""
         return [
@@ -50,32 +58,17 @@ class PHPAnalyzer(BaseAnalyzer):
         print(f"🔍 Analisando projeto PHP: {project_path.name}")
         
         # Escanear arquivos
-        scanned_files = self.scan_files(project_path)
-        
-        # Categorizar arquivos
-        migration_files = []
-        code_files = []
-        validation_files = []
-        test_files = []
-        
-        for file_info in scanned_files:
-            file_path = file_info['file_path']
-            content = file_info['content']
-            
-            if self._is_migration_file(file_path):
-                migration_files.append((file_path, content))
-            elif self._is_test_file(file_path):
-                test_files.append((file_path, content))
-            elif self._is_validation_file(file_path):
-                validation_files.append((file_path, content))
-            else:
-                code_files.append((file_path, content))
+        # Dos filtros, só o tamanho máximo de arquivo e o cache se aplicam ao PHP
+        read_filters = {key: value for key, value in (filters or {}).items()
+                        if key in ('max_file_size', 'cache_dir')}
         
-        # Analisar cada categoria usando analisadores especializados
-        migration_fields = self._analyze_migrations(migration_files)
-        code_fields = self._analyze_code(code_files)
-        validation_fields = self._analyze_validations(validation_files)
-        test_fields = self._analyze_tests(test_files)
+        # Analisar cada arquivo com o analisador especializado da sua categoria
+        migration_fields = []
+        code_fields = []
+        validation_fields = []
+        test_fields = []
+        results = (migration_fields, code_fields, validation_fields, test_fields)
+        scan = self._scan_project(project_path, read_filters, self._analyze_file, results)
         
         # Converter para CNPJField
         all_fields = []
@@ -176,7 +169,7 @@ class PHPAnalyzer(BaseAnalyzer):
             'validations_found': [],
             'frontend_masks': [],
             'overall_impact': overall_impact.value if overall_impact else 'baixo',
-            'files_scanned': len(scanned_files),
+            **scan,
             'framework_detected': self._detect_framework(),
             'categories': {
                 'migrations': len(migration_fields),
@@ -186,6 +179,24 @@ class PHPAnalyzer(BaseAnalyzer):
             }
         }
     
+    def _analyze_file(self, file_info: Dict) -> Tuple[List[PHPFieldDefinition], ...]:
+        """Analisa um arquivo com o analisador da sua categoria
+        
+        Retorna (migrations, código, validações, testes); só a lista da
+        categoria do arquivo pode ter campos.
+        """
+        file_path = file_info['file_path']
+        files = [(file_path, file_info['content'])]
+        
+        if self._is_migration_file(file_path):
+            return self._analyze_migrations(files), [], [], []
+        elif self._is_test_file(file_path):
+            return [], [], [], self._analyze_tests(files)
+        elif self._is_validation_file(file_path):
+            return [], [], self._analyze_validations(files), []
+        else:
+            return [], self._analyze_code(files), [], []
+    
     def _analyze_migrations(self, migration_files: List[tuple]) -> List[PHPFieldDefinition]:
         """Analisa arquivos de migration usando o analisador especializado"""
         fields = []
@@ -7,7 +7,7 @@ Data: 2025-01-27
 import re
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from .base_analyzer import BaseAnalyzer
 from dto import CNPJFieldUI, CNPJFieldInterface, ImpactLevel, Status
@@ -340,66 +340,68 @@ class UIAnalyzer(BaseAnalyzer):
     def find_validations(self, files: List[Dict]) -> List[CNPJFieldInterface]:
         """Encontra validações relacionadas a CNPJ - versão UI"""
         validations = []
+        literal_search = self._literal_res['validation_patterns'].search
+        union_re = self._union_res['validation_patterns']
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['validation_patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        # Extrair nome do campo
-                        field_name = self._extract_field_name_from_line(line)
-                        if field_name:
-                            validations.append(self.create_cnpj_field(
-                                file_path=file_path,
-                                line_number=line_num,
-                                field_name=field_name,
-                                field_type='VALIDATION_FUNCTION',
-                                field_size=None,
-                                context=line.strip(),
-                                project_type=self.project_type,
-                                impact_level=ImpactLevel.HIGH,
-                                status=Status.NEEDS_ANALYSIS,
-                                action_needed='Função de validação precisa ser atualizada para CNPJ alfanumérico',
-                                estimated_effort='1-2 dias',
-                                component_type=self._extract_component_type(file_path),
-                                validation_rules=['validate']
-                            ))
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                # Extrair nome do campo
+                field_name = self._extract_field_name_from_line(line)
+                if field_name:
+                    validations.append(self.create_cnpj_field(
+                        file_path=file_path,
+                        line_number=line_num,
+                        field_name=field_name,
+                        field_type='VALIDATION_FUNCTION',
+                        field_size=None,
+                        context=line.strip(),
+                        project_type=self.project_type,
+                        impact_level=ImpactLevel.HIGH,
+                        status=Status.NEEDS_ANALYSIS,
+                        action_needed='Função de validação precisa ser atualizada para CNPJ alfanumérico',
+                        estimated_effort='1-2 dias',
+                        component_type=self._extract_component_type(file_path),
+                        validation_rules=['validate']
+                    ))
         
         return validations
 
     def find_frontend_masks(self, files: List[Dict]) -> List[CNPJFieldInterface]:
         """Encontra máscaras de CNPJ no frontend - versão UI"""
         masks = []
+        literal_search = self._literal_res['mask_patterns'].search
+        union_re = self._union_res['mask_patterns']
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['mask_patterns']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        # Extrair nome do campo
-                        field_name = self._extract_field_name_from_line(line)
-                        if field_name:
-                            masks.append(self.create_cnpj_field(
-                                file_path=file_path,
-                                line_number=line_num,
-                                field_name=field_name,
-                                field_type='MASK_FUNCTION',
-                                field_size=None,
-                                context=line.strip(),
-                                project_type=self.project_type,
-                                impact_level=ImpactLevel.MEDIUM,
-                                status=Status.NEEDS_ANALYSIS,
-                                action_needed='Máscara precisa ser atualizada para CNPJ alfanumérico',
-                                estimated_effort='4-8 horas',
-                                component_type=self._extract_component_type(file_path),
-                                mask_pattern=self._extract_mask_pattern(line)
-                            ))
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                # Extrair nome do campo
+                field_name = self._extract_field_name_from_line(line)
+                if field_name:
+                    masks.append(self.create_cnpj_field(
+                        file_path=file_path,
+                        line_number=line_num,
+                        field_name=field_name,
+                        field_type='MASK_FUNCTION',
+                        field_size=None,
+                        context=line.strip(),
+                        project_type=self.project_type,
+                        impact_level=ImpactLevel.MEDIUM,
+                        status=Status.NEEDS_ANALYSIS,
+                        action_needed='Máscara precisa ser atualizada para CNPJ alfanumérico',
+                        estimated_effort='4-8 horas',
+                        component_type=self._extract_component_type(file_path),
+                        mask_pattern=self._extract_mask_pattern(line)
+                    ))
         
         return masks
 
@@ -539,22 +541,23 @@ class UIAnalyzer(BaseAnalyzer):
     def find_cnpj_fields(self, files: List[Dict]) -> List[CNPJFieldInterface]:
         """Encontra campos relacionados a CNPJ nos arquivos UI"""
         cnpj_fields = []
+        literal_search = self._literal_res['field_names'].search
+        union_re = self._union_res['field_names']
         
 
         
         for file_info in files:
             file_path = file_info['file_path']
             content = file_info['content']
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for pattern in self.cnpj_patterns['field_names']:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        field = self._analyze_ui_cnpj_field(
-                            file_path, line_num, line, content
-                        )
-                        if field:
-                            cnpj_fields.append(field)
+            content_lower = self._lowered(file_info)
+            if not literal_search(content_lower):
+                continue
+            for line_num, line in self._iter_matching_lines(content, content_lower, union_re):
+                field = self._analyze_ui_cnpj_field(
+                    file_path, line_num, line, content
+                )
+                if field:
+                    cnpj_fields.append(field)
         
 
         return cnpj_fields
@@ -735,43 +738,55 @@ class UIAnalyzer(BaseAnalyzer):
         else:
             return ImpactLevel.MEDIUM, Status.NEEDS_ANALYSIS, "Análise manual necessária"
 
+    def _find_framework_specific(self, files: List[Dict]) -> Dict[str, List[Dict]]:
+        """Encontra os padrões específicos do framework do analisador"""
+        if self.framework == 'react':
+            return self.find_react_specific(files)
+        elif self.framework == 'vue':
+            return self.find_vue_specific(files)
+        elif self.framework == 'angular':
+            return self.find_angular_specific(files)
+        return {}
+
+    def _analyze_file(self, file_info: Dict) -> Tuple[Any, ...]:
+        """Roda os finders de UI em um arquivo
+        
+        Retorna, nesta ordem: campos CNPJ, validações, máscaras, máscaras de
+        input, validações de formulário, padrões do framework e padrões UI. Como
+        cada finder percorre os arquivos em ordem, juntar os resultados arquivo a
+        arquivo dá as mesmas listas que rodar cada finder no projeto inteiro.
+        """
+        batch = [file_info]
+        return (
+            self.find_cnpj_fields(batch),
+            self.find_validations(batch),
+            self.find_frontend_masks(batch),
+            self.find_input_masks(batch),
+            self.find_form_validations(batch),
+            self._find_framework_specific(batch),
+            self.find_ui_specific_patterns(batch)
+        )
+
     def analyze_project(self, project_path: Path, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analisa um projeto de UI e retorna os resultados"""
         project_name = project_path.name if hasattr(project_path, 'name') else str(project_path).split('/')[-1]
         self.console.print(f"[blue]Analisando projeto UI ({self.framework}): {project_name}[/blue]")
         
-        # Escanear arquivos
-        files = self.scan_files(project_path, filters)
-        
         # Escanear package.json
         package_info = self.scan_package_json(project_path)
         
-        # Encontrar campos CNPJ
-        cnpj_fields = self.find_cnpj_fields(files)
-        
-        # Encontrar validações
-        validations = self.find_validations(files)
-        
-        # Encontrar máscaras
-        masks = self.find_frontend_masks(files)
-        
-        # Encontrar máscaras de input específicas
-        input_masks = self.find_input_masks(files)
-        
-        # Encontrar validações de formulário
-        form_validations = self.find_form_validations(files)
-        
-        # Encontrar padrões específicos do framework
-        framework_specific = {}
-        if self.framework == 'react':
-            framework_specific = self.find_react_specific(files)
-        elif self.framework == 'vue':
-            framework_specific = self.find_vue_specific(files)
-        elif self.framework == 'angular':
-            framework_specific = self.find_angular_specific(files)
-        
-        # Encontrar padrões UI específicos
-        ui_patterns = self.find_ui_specific_patterns(files)
+        # Rodar os finders arquivo a arquivo (ver _scan_project); os
+        # dicionários começam com as chaves que os finders geram
+        cnpj_fields = []
+        validations = []
+        masks = []
+        input_masks = []
+        form_validations = []
+        framework_specific = self._find_framework_specific([])
+        ui_patterns = self.find_ui_specific_patterns([])
+        results = (cnpj_fields, validations, masks, input_masks, form_validations,
+                   framework_specific, ui_patterns)
+        scan = self._scan_project(project_path, filters, self._analyze_file, results)
         
         # Combinar todos os campos encontrados
         all_fields = cnpj_fields + validations + masks + input_masks + form_validations
@@ -797,7 +812,7 @@ class UIAnalyzer(BaseAnalyzer):
             'validations_found': validations,
             'frontend_masks': masks,
             'overall_impact': overall_impact.value if overall_impact else 'baixo',
-            'files_scanned': len(files),
+            **scan,
             'framework_detected': self.framework,
             'package_info': package_info,
             'input_masks': input_masks,
@@ -10,9 +10,14 @@ from dataclasses import dataclass
 
 from .cnpj_field_interface import CNPJFieldInterface, ImpactLevel, Status
 
-@dataclass
+@dataclass(slots=True)
 class CNPJFieldBase(CNPJFieldInterface):
-    """Implementação base do CNPJField"""
+    """Implementação base do CNPJField
+    
+    Com slots=True o dataclass recria a classe, e o super() sem argumentos das
+    subclasses apontaria para a classe original; por isso os to_dict das
+    subclasses chamam CNPJFieldBase.to_dict(self) diretamente.
+    """
     
     file_path: str
     line_number: int
@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from .cnpj_field_base import CNPJFieldBase
 from .cnpj_field_interface import ImpactLevel, Status
 
-@dataclass
+@dataclass(slots=True)
 class CNPJFieldETL(CNPJFieldBase):
     """Implementação específica do CNPJField para ETL"""
     
@@ -24,7 +24,7 @@ class CNPJFieldETL(CNPJFieldBase):
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte o campo para dicionário serializável com campos ETL específicos"""
-        base_dict = super().to_dict()
+        base_dict = CNPJFieldBase.to_dict(self)
         base_dict.update({
             'etl_tool': self.etl_tool,
             'etl_type': self.etl_type,
@@ -25,6 +25,9 @@ class Status(Enum):
 class CNPJFieldInterface(ABC):
     """Interface base para CNPJField"""
     
+    # Sem __dict__ por instância: as implementações são dataclasses com slots
+    __slots__ = ()
+    
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """Converte o campo para dicionário serializável"""
@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from .cnpj_field_base import CNPJFieldBase
 from .cnpj_field_interface import ImpactLevel, Status
 
-@dataclass
+@dataclass(slots=True)
 class CNPJFieldNest(CNPJFieldBase):
     """Implementação específica do CNPJField para NestJS"""
     
@@ -23,7 +23,7 @@ class CNPJFieldNest(CNPJFieldBase):
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte o campo para dicionário serializável com campos NestJS específicos"""
-        base_dict = super().to_dict()
+        base_dict = CNPJFieldBase.to_dict(self)
         base_dict.update({
             'nest_type': self.nest_type,
             'decorator_type': self.decorator_type,
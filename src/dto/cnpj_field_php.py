@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from .cnpj_field_base import CNPJFieldBase
 from .cnpj_field_interface import ImpactLevel, Status
 
-@dataclass
+@dataclass(slots=True)
 class CNPJFieldPHP(CNPJFieldBase):
     """Implementação específica do CNPJField para PHP"""
     
@@ -23,7 +23,7 @@ class CNPJFieldPHP(CNPJFieldBase):
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte o campo para dicionário serializável com campos PHP específicos"""
-        base_dict = super().to_dict()
+        base_dict = CNPJFieldBase.to_dict(self)
         base_dict.update({
             'php_type': self.php_type,
             'sql_type': self.sql_type,
@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from .cnpj_field_base import CNPJFieldBase
 from .cnpj_field_interface import ImpactLevel, Status
 
-@dataclass
+@dataclass(slots=True)
 class CNPJFieldUI(CNPJFieldBase):
     """Implementação específica do CNPJField para UI"""
     
@@ -22,7 +22,7 @@ class CNPJFieldUI(CNPJFieldBase):
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte o campo para dicionário serializável com campos UI específicos"""
-        base_dict = super().to_dict()
+        base_dict = CNPJFieldBase.to_dict(self)
         base_dict.update({
             'component_type': self.component_type,
             'event_handlers': self.event_handlers,
@@ -0,0 +1,97 @@
+"""
+Scan Cache - Cache em disco dos resultados da análise por arquivo
+Versão: 1.0
+Data: 2025-08-29
+"""
+
+import os
+import shelve
+import hashlib
+import functools
+import threading
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+# Incrementar quando o formato das entradas mudar. Mudanças no código dos
+# analisadores não precisam disso: são detectadas por _code_fingerprint
+CACHE_VERSION = 1
+
+
+@functools.cache
+def _code_fingerprint() -> str:
+    """Hash dos arquivos .py de src/ (analisadores, padrões, DTOs)
+    
+    Faz parte da chave de cada entrada: após qualquer alteração no código de
+    análise (por exemplo, uma atualização da ferramenta) os resultados antigos
+    deixam de ser usados e são substituídos na execução seguinte. Calculado uma
+    vez por processo, ao abrir o primeiro cache.
+    """
+    src_root = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha1()
+    for path in sorted(src_root.rglob('*.py')):
+        digest.update(str(path.relative_to(src_root)).encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ScanCache:
+    """Cache em disco (shelve) dos resultados da análise de cada arquivo
+
+    Cada resultado é guardado pelo caminho absoluto do arquivo junto com
+    CACHE_VERSION, o hash do código de análise, o namespace (analisador), o
+    mtime_ns e o tamanho do arquivo, e só é usado se todos coincidirem: um
+    arquivo inalterado custa apenas um stat() na execução seguinte, e um
+    arquivo alterado substitui a entrada antiga. Cada projeto tem seu próprio
+    arquivo de cache, para que processos analisando projetos diferentes não
+    escrevam no mesmo banco. Para descartar o cache basta apagar o diretório.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], namespace: str, project_path: Union[str, Path]):
+        self.namespace = namespace
+        # Parte da chave comum a todos os arquivos, calculada uma única vez
+        self._stamp = (CACHE_VERSION, _code_fingerprint(), namespace)
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        project_id = hashlib.sha1(os.path.abspath(project_path).encode('utf-8')).hexdigest()[:16]
+        self._db = shelve.open(str(cache_dir / f"{namespace}_{project_id}"))
+        # O shelve não é seguro entre threads (leituras rodam no pool de scan_files)
+        self._lock = threading.Lock()
+
+    def key(self, file_path: Union[str, Path]) -> Optional[Tuple[str, tuple]]:
+        """Retorna a chave do estado atual do arquivo (None se não for possível o stat)"""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), self._stamp + (st.st_mtime_ns, st.st_size)
+
+    def get(self, key: Optional[Tuple[str, tuple]]) -> Optional[Any]:
+        """Retorna o resultado guardado para a chave, ou None"""
+        if key is None:
+            return None
+        path, stamp = key
+        with self._lock:
+            entry = self._db.get(path)
+        if entry is None or entry[0] != stamp:
+            return None
+        return entry[1]
+
+    def set(self, key: Optional[Tuple[str, tuple]], value: Any):
+        """Guarda o resultado de um arquivo"""
+        if key is None:
+            return
+        path, stamp = key
+        with self._lock:
+            self._db[path] = (stamp, value)
+
+    def close(self):
+        """Grava e fecha o cache"""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> 'ScanCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()